@@ -157,24 +157,104 @@
 #successfull running code for docker hugging face
 
 import os
-import json
 import time
+import uuid
 import asyncio
-from fastapi import FastAPI, HTTPException
+import functools
+import json
+import logging
+import random
+import threading
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from models.sentiment import analyze_sentiment
-from models.summarizer import summarize
-from models.hindi_tts import process_and_generate_tts
-from models.comparative_analysis import generate_comparative_analysis
-from utils.scraper import extract_news
+from typing import Optional
+from pydantic import BaseModel, Field
+from models import inference_threads, sentiment, summarizer
+from models.sentiment import analyze_sentiment, summarize_sentiment
+from models.summarizer import ERROR_SUMMARY, submit_summaries, summary_scheduler
+from models.hindi_tts import (
+    process_and_generate_tts,
+    start_audio_janitor,
+    stream_tts,
+    translate_to_hindi,
+    tts_cache_stats,
+    unique_audio_path,
+)
+from models.comparative_analysis import generate_comparative_analysis, save_comparative_analysis
+from utils.metrics import ServerTimingMiddleware, count_fallback, metrics, stage_timer
+from utils.jobs import FINISHED_STATUSES, JobQueueFull, JobStore, JobWorkerPool
+from utils.singleflight import AsyncSingleFlight
+from utils.scraper import DEFAULT_MAX_ARTICLES, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, http_stats, iter_news_pages, news_cache_stats
 
 # ============================
 # ✅ FastAPI Backend
 # ============================
 
+# ----------------------------
+# ✅ Logging
+# ----------------------------
+# Per-article lines are debug level and sampled, so the hot path doesn't flood stdout
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("api")
+logger.setLevel(LOG_LEVEL)
+
+
+def log_sampled(level):
+    """True for a LOG_SAMPLE_RATE share of calls, when `level` is enabled at all."""
+    return logger.isEnabledFor(level) and random.random() < LOG_SAMPLE_RATE
+
+
+# ----------------------------
+# ✅ Model warm-up
+# ----------------------------
+# Models load lazily on first use; warm-up runs in the background so /health answers immediately
+models_ready = threading.Event()
+
+
+def warm_up_models():
+    """Load the summarizer and sentiment lexicon, then mark the API as ready."""
+    try:
+        start = time.perf_counter()
+        summarizer.warm_up()
+        sentiment.warm_up()
+        logger.info("🔥 Models warmed up in %.1fs", time.perf_counter() - start)
+        models_ready.set()
+    except Exception:
+        logger.exception("❌ Model warm-up failed")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if os.getenv("WARMUP_MODELS", "1") == "1":
+        threading.Thread(target=warm_up_models, name="model-warm-up", daemon=True).start()
+    else:
+        # Models still load lazily on the first request
+        models_ready.set()
+
+    # Evict old per-request and cached audio by age and disk budget
+    start_audio_janitor([directory for directory in (output_dir, audio_cache_dir) if directory])
+
+    audio_jobs.start()
+    # Other workers' /metrics read this worker's counters from its snapshots
+    metrics.start_flusher()
+    yield
+    await audio_jobs.stop()
+    # Counts since the last flush would otherwise be missing from this worker's tombstone
+    try:
+        metrics.write_snapshot()
+    except OSError as e:
+        logger.warning("⚠️ Could not write final metrics snapshot: %s", e)
+
+
 # Initialize FastAPI
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ServerTimingMiddleware)
 
 # ----------------------------
 # ✅ Define correct paths for Docker/Hugging Face
@@ -183,6 +263,9 @@ app = FastAPI()
 output_dir = "/tmp/output"
 data_dir = "/tmp/data"
 
+# Persist each request's comparative analysis to data_dir (off by default)
+save_comparative_results = os.getenv("SAVE_COMPARATIVE_ANALYSIS", "0") == "1"
+
 # ✅ Create required directories if they don't exist
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
@@ -190,115 +273,380 @@ if not os.path.exists(output_dir):
 if not os.path.exists(data_dir):
     os.makedirs(data_dir)
 
+# ✅ Cached TTS audio lives inside the output directory so the static mount serves it
+audio_cache_dir = os.path.join(output_dir, "tts_cache") if os.getenv("TTS_AUDIO_CACHE", "1") == "1" else None
+
 # ✅ Mount the output directory to serve audio files
 app.mount("/output", StaticFiles(directory=output_dir), name="output")
 
 
 class RequestData(BaseModel):
     company_name: str
+    # Optional per-request overrides for how much coverage to fetch
+    page_size: Optional[int] = Field(None, ge=1, le=MAX_PAGE_SIZE)
+    max_articles: Optional[int] = Field(None, ge=1, le=100)
+    # Return a /tts/stream URL instead of waiting for the audio file to be synthesized
+    stream_audio: bool = False
+
+
+# Bounded pool for CPU-bound model work (sentiment, comparison); summaries go through the scheduler
+model_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("MODEL_EXECUTOR_WORKERS", "4")), thread_name_prefix="model"
+)
+
+
+async def run_model_task(func, *args):
+    """Run CPU-bound model work on the bounded executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(model_executor, functools.partial(func, *args))
+
+
+def parse_article(article):
+    """Return `(title, content, topics)` for a scraped article string or dict."""
+    # Check if article is string or dictionary
+    if isinstance(article, str):
+        parsed = article.split(":")[0], article, ["General"]
+    else:
+        parsed = (
+            article.get("Title", "No title available."),
+            article.get("Summary", "No content available."),
+            article.get("Topics", ["General"]),
+        )
+    if log_sampled(logging.DEBUG):
+        logger.debug("👍 Processing article: %s (%d chars)", parsed[0], len(parsed[1]))
+    return parsed
+
+
+async def analyze_article(title, summary_future, topics):
+    """Wait for one article's summary, then score its sentiment."""
+    # Includes the time queued for a shared batch, which is part of the request's latency
+    with stage_timer("summarize"):
+        summary = await asyncio.wrap_future(summary_future)
+    if summary == ERROR_SUMMARY:
+        count_fallback("summarize", "error_summary")
+    with stage_timer("sentiment"):
+        sentiment = await run_model_task(analyze_sentiment, summary)
+    return {
+        "Title": title,
+        "Summary": summary,
+        "Sentiment": sentiment.lower(),
+        "Topics": topics,
+    }
+
+
+async def compare_articles(article_data):
+    """Run the comparative analysis in memory."""
+    with stage_timer("compare"):
+        return await run_model_task(generate_comparative_analysis, article_data)
+
+
+def persist_comparative_analysis(results, company_name):
+    """Optional sink: save a request's comparative results under a unique file name."""
+    output_file = os.path.join(data_dir, f"comparative_analysis_{uuid.uuid4().hex}.json")
+    try:
+        save_comparative_analysis({"Company": company_name, **results}, output_file)
+    except Exception as e:
+        logger.warning("⚠️ Could not save comparative analysis: %s", e)
+
+
+async def generate_audio(tts_text):
+    """Translate and synthesize the Hindi audio, returning its URL or None."""
+    if audio_cache_dir:
+        # Repeat phrases are served from the content-addressed store under /output
+        audio_path = await process_and_generate_tts(tts_text, cache_dir=audio_cache_dir)
+    else:
+        # ✅ Each request gets its own .mp3 so concurrent requests never overwrite each other
+        audio_path = await process_and_generate_tts(tts_text, unique_audio_path(output_dir))
+
+    # ✅ Check if audio_path is valid and exists
+    if audio_path and os.path.exists(audio_path):
+        logger.debug("🎵 TTS audio at: %s", audio_path)
+        return "/output/" + os.path.relpath(audio_path, output_dir).replace(os.sep, "/")
+    logger.warning("⚠️ Audio file NOT created or path incorrect: %s", audio_path)
+    count_fallback("tts", "no_audio")
+    return None
+
+
+async def run_audio_job(tts_text):
+    """Background TTS job: the result holds the audio URL once the file is written."""
+    audio_url = await generate_audio(tts_text)
+    if audio_url is None:
+        raise RuntimeError("Audio generation failed")
+    return {"Audio": audio_url}
+
+
+# ✅ /process returns without waiting for TTS; audio is produced by a bounded pool of
+# background workers and its status is kept in SQLite so any uvicorn worker can report it
+use_audio_jobs = os.getenv("AUDIO_JOBS", "1") == "1"
+job_store = JobStore(
+    os.getenv("JOBS_DB", os.path.join(data_dir, "jobs.sqlite3")),
+    max_age=float(os.getenv("JOB_TTL_SECONDS", "3600")),
+)
+audio_jobs = JobWorkerPool(
+    job_store,
+    "audio",
+    run_audio_job,
+    workers=int(os.getenv("AUDIO_JOB_WORKERS", "2")),
+    max_queue=int(os.getenv("AUDIO_JOB_QUEUE", "32")),
+    timeout=float(os.getenv("AUDIO_JOB_TIMEOUT", "120")),
+)
+# How often /jobs/{id}/events checks for a status change
+JOB_EVENTS_POLL_INTERVAL = 0.25
+
+
+async def submit_audio_job(tts_text):
+    """Queue the TTS job and describe it for the response; rejected when the queue is full."""
+    try:
+        job_id = await audio_jobs.submit(tts_text)
+        status = "queued"
+    except JobQueueFull as e:
+        logger.warning("⚠️ Audio queue full, rejecting job %s", e.job_id)
+        job_id = e.job_id
+        status = "rejected"
+    return {
+        "id": job_id,
+        "status": status,
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events",
+    }
+
+
+# Identical concurrent /process requests share one pipeline run, and its result is
+# reused for PROCESS_REUSE_SECONDS afterwards
+process_flight = AsyncSingleFlight(reuse_seconds=float(os.getenv("PROCESS_REUSE_SECONDS", "30")))
 
 
 @app.post("/process")
-def process_request(data: RequestData):
+async def process_request(data: RequestData, background_tasks: BackgroundTasks):
     """Process news, sentiment, summarization, and TTS for a company."""
     company_name = data.company_name.strip()
-    print(f"🔎 Processing request for: {company_name}")
+    logger.info("🔎 Processing request for: %s", company_name)
 
     if not company_name:
         raise HTTPException(status_code=400, detail="Company name is required")
 
-    # Extract news articles
-    articles = extract_news(company_name)
-    print(f"📰 Articles Extracted: {articles}")
+    page_size = data.page_size or DEFAULT_PAGE_SIZE
+    max_articles = data.max_articles or DEFAULT_MAX_ARTICLES
+    request_key = (" ".join(company_name.lower().split()), page_size, max_articles, data.stream_audio)
+    result = await process_flight.do(
+        request_key, lambda: run_pipeline(company_name, page_size, max_articles, data.stream_audio)
+    )
+
+    # Written after the response is sent, so the hot path never touches disk
+    if save_comparative_results:
+        background_tasks.add_task(
+            persist_comparative_analysis, result["Comparative Sentiment Score"], company_name
+        )
+
+    return result
+
+
+async def schedule_articles(company_name, page_size, max_articles, completed):
+    """Fetch pages and start each article's analysis; finished articles go onto `completed`.
+
+    Each entry is `(index, task)`; a final `(None, count)` marks that every page
+    has been fetched.
+    """
+    # Extract news articles page by page (blocking HTTP calls, kept off the event loop).
+    # Summaries are batched with jobs from other in-flight requests, so a page's
+    # articles are being summarized while the next page is fetched, and each
+    # article's sentiment starts as soon as its own summary is ready.
+    pages = iter_news_pages(company_name, page_size=page_size, max_articles=max_articles)
+    count = 0
+    try:
+        while True:
+            with stage_timer("scrape"):
+                articles = await asyncio.to_thread(next, pages, None)
+            if articles is None:
+                break
+            logger.debug("📰 Fetched %d articles for %s", len(articles), company_name)
+
+            parsed_articles = [parse_article(article) for article in articles]
+            futures = submit_summaries([content for _, content, _ in parsed_articles])
+            for (title, _, topics), future in zip(parsed_articles, futures):
+                task = asyncio.create_task(analyze_article(title, future, topics))
+                task.add_done_callback(functools.partial(lambda index, done: completed.put_nowait((index, done)), count))
+                count += 1
+    finally:
+        completed.put_nowait((None, count))
+
+
+async def pipeline_events(company_name, page_size, max_articles, stream_audio=False):
+    """Scrape, summarize, score, compare and voice the news for one company.
+
+    Yields `(event, data)` as results become available: an "article" for each
+    article as soon as it is scored (in completion order, with its "Index"),
+    then "comparative", then "final" with the overall sentiment and audio.
+    """
+    completed = asyncio.Queue()
+    fetcher = asyncio.create_task(schedule_articles(company_name, page_size, max_articles, completed))
+    articles = {}
+    total = None
+    try:
+        while total is None or len(articles) < total:
+            index, item = await completed.get()
+            if index is None:
+                total = item
+                continue
+            articles[index] = item.result()
+            yield "article", {"Index": index, **articles[index]}
+        await fetcher
+    finally:
+        fetcher.cancel()
 
     if not articles:
         raise HTTPException(status_code=404, detail="No articles found")
 
-    article_data = []
-    sentiments = []
-
-    for article in articles:
-        print(f"👍 Processing article: {article}")
-
-        # Check if article is string or dictionary
-        if isinstance(article, str):
-            content = article
-            title = article.split(":")[0]
-            topics = ["General"]
-        else:
-            content = article.get("Summary", "No content available.")
-            title = article.get("Title", "No title available.")
-            topics = article.get("Topics", ["General"])
-
-        # Summarize and analyze each article
-        summary = summarize(content)
-        sentiment = analyze_sentiment(summary)
-
-        article_data.append(
-            {
-                "Title": title,
-                "Summary": summary,
-                "Sentiment": sentiment.lower(),
-                "Topics": topics,
-            }
-        )
-        sentiments.append(sentiment.lower())
-
-    # Comparative Sentiment Analysis
-    comparative_output_file = os.path.join(data_dir, "comparative_analysis.json")
-    generate_comparative_analysis(article_data, comparative_output_file)
-    time.sleep(1)
-
-    if os.path.exists(comparative_output_file):
-        with open(comparative_output_file, "r", encoding="utf-8") as file:
-            comparative_results = json.load(file)
+    article_data = [articles[index] for index in range(total)]
+    final_sentiment_analysis = summarize_sentiment(
+        company_name, [article["Sentiment"] for article in article_data]
+    )
+
+    final = {"Final Sentiment Analysis": final_sentiment_analysis}
+    audio_task = None
+    if stream_audio:
+        # The client fetches the audio itself and starts playing on the first chunk
+        final["Audio"] = "/tts/stream?" + urlencode({"text": final_sentiment_analysis})
+    elif use_audio_jobs:
+        # Audio arrives later through /jobs/{id}; the analysis is returned right away
+        final["Audio"] = None
+        final["Audio Job"] = await submit_audio_job(final_sentiment_analysis)
     else:
-        comparative_results = {"message": "No comparative results available."}
-
-    # Generate Sentiment Summary
-    positive_count = sentiments.count("positive")
-    negative_count = sentiments.count("negative")
-    neutral_count = sentiments.count("neutral")
+        # The comparison and the Hindi TTS only depend on the article results, so overlap them
+        audio_task = asyncio.create_task(generate_audio(final_sentiment_analysis))
+
+    yield "comparative", await compare_articles(article_data)
+
+    if audio_task is not None:
+        final["Audio"] = await audio_task
+    yield "final", final
+
+
+async def run_pipeline(company_name, page_size, max_articles, stream_audio=False):
+    """Run the whole pipeline and return the combined /process response."""
+    articles = {}
+    result = {"Company": company_name}
+    async for event, data in pipeline_events(company_name, page_size, max_articles, stream_audio):
+        if event == "article":
+            articles[data.pop("Index")] = data
+        elif event == "comparative":
+            result["Articles"] = [articles[index] for index in sorted(articles)]
+            result["Comparative Sentiment Score"] = data
+        else:
+            result.update(data)
+    return result
 
-    if positive_count > negative_count:
-        final_sentiment_analysis = f"{company_name}’s latest news coverage is mostly positive."
-    elif negative_count > positive_count:
-        final_sentiment_analysis = f"{company_name}’s recent news coverage raises concerns about regulatory hurdles."
-    else:
-        final_sentiment_analysis = f"{company_name}’s latest news reflects a neutral sentiment."
 
-    # ----------------------------
-    # ✅ Generate Hindi TTS
-    # ----------------------------
-    tts_text = final_sentiment_analysis
+def sse_event(event, data):
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    # ✅ Correct audio file extension to .mp3
-    audio_filename = "hindi_tts_output.mp3"
-    audio_path_ = os.path.join(output_dir, audio_filename)
 
-    # ✅ Call process_and_generate_tts as an async function
-    audio_path = asyncio.run(process_and_generate_tts(tts_text, audio_path_))
+@app.post("/process/stream")
+async def process_stream(data: RequestData, background_tasks: BackgroundTasks):
+    """Like /process, but streams server-sent events as each part of the result is ready.
 
-    print(f"🎧 TTS Generated at: {audio_path}")
+    Events: "article" per article (with its "Index"), "comparative", then
+    "final"; an "error" event replaces the rest if the pipeline fails.
+    """
+    company_name = data.company_name.strip()
+    logger.info("🔎 Streaming request for: %s", company_name)
 
-    # ✅ Check if audio_path is valid and exists
-    if audio_path and os.path.exists(audio_path):
-        print(f"🎵 Audio file exists: {audio_path}")
-        audio_url = f"/output/{audio_filename}"
-    else:
-        print(f"⚠️ Audio file NOT created or path incorrect: {audio_path}")
-        audio_url = None
+    if not company_name:
+        raise HTTPException(status_code=400, detail="Company name is required")
 
+    page_size = data.page_size or DEFAULT_PAGE_SIZE
+    max_articles = data.max_articles or DEFAULT_MAX_ARTICLES
+
+    async def events():
+        try:
+            async for event, payload in pipeline_events(company_name, page_size, max_articles, data.stream_audio):
+                if event == "comparative" and save_comparative_results:
+                    background_tasks.add_task(persist_comparative_analysis, payload, company_name)
+                yield sse_event(event, payload)
+        except HTTPException as e:
+            yield sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception:
+            logger.exception("❌ Streaming pipeline failed")
+            yield sse_event("error", {"status_code": 500, "detail": "Internal Server Error"})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/jobs/{job_id}")
+def read_job(job_id: str):
+    """Status of a background job; `result.Audio` holds the audio URL once it is done."""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events: one `status` event per change, ending when the job finishes."""
+    if await asyncio.to_thread(job_store.get, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_status = None
+        while True:
+            job = await asyncio.to_thread(job_store.get, job_id)
+            if job is None:
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield sse_event("status", job)
+            if last_status in FINISHED_STATUSES:
+                return
+            await asyncio.sleep(JOB_EVENTS_POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/tts/stream")
+async def stream_audio(text: str = Query(..., min_length=1, max_length=1000)):
+    """Translate text to Hindi and stream the MP3 as each segment is synthesized."""
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Text is required")
+
+    hindi_text = await translate_to_hindi(text.strip())
+    if not hindi_text:
+        raise HTTPException(status_code=502, detail="Translation failed")
+
+    return StreamingResponse(stream_tts(hindi_text, cache_dir=audio_cache_dir), media_type="audio/mpeg")
+
+
+@app.get("/stats")
+def read_stats():
+    """Runtime metrics for tuning throughput vs. tail latency."""
     return {
-        "Company": company_name,
-        "Articles": article_data,
-        "Comparative Sentiment Score": comparative_results,
-        "Final Sentiment Analysis": final_sentiment_analysis,
-        "Audio": audio_url,
+        "summarizer_batching": summary_scheduler.stats(),
+        "summary_cache": summarizer.summary_cache.stats(),
+        "inference_threads": inference_threads.stats(),
+        "newsapi_http": http_stats(),
+        "news_cache": news_cache_stats(),
+        "process_single_flight": process_flight.stats(),
+        "tts_cache": tts_cache_stats(),
+        "audio_jobs": audio_jobs.stats(),
     }
 
 
+@app.get("/metrics")
+def read_metrics():
+    """Prometheus metrics: per-stage latency histograms, stage errors and fallbacks, request durations."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 def read_root():
     """Health check endpoint."""
     return {"message": "API is running successfully!"}
+
+
+@app.get("/ready")
+def read_ready():
+    """Readiness check: succeeds once the models have been warmed up."""
+    if not models_ready.is_set():
+        raise HTTPException(status_code=503, detail="Models are still loading")
+    return {"message": "Models are loaded and ready."}
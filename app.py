@@ -1,16 +1,118 @@
+import json
 import streamlit as st
 import requests
 import os
-import time  # ⏰ Added to ensure audio sync
 
 # ✅ Corrected API URL for FastAPI running via Docker
 API_URL = "https://rakeshrocky-1999-fast-api-tts.hf.space/process"  # Use the Docker-exposed port from hugging face
 # API_URL = "http://127.0.0.1:8000/process" -- use for local machine
+# Server-sent events version of /process that sends each article as soon as it is ready
+STREAM_API_URL = f"{API_URL}/stream"
 
 # Define the output directory where audio files are stored
 OUTPUT_DIR = "output"  # Matches the FastAPI audio directory
 
 
+def read_events(response):
+    """Yield `(event, data)` pairs from a server-sent events response."""
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line:
+            field, _, value = line.partition(":")
+            if field == "event":
+                event = value.strip()
+            elif field == "data":
+                data.append(value.strip())
+        elif data:
+            yield event, json.loads("\n".join(data))
+            event, data = "message", []
+
+
+def render_article(article):
+    """Render one article as soon as it arrives."""
+    st.write(f"### 📝 Article {article['Index'] + 1}")
+    st.write(f"**Title:** {article['Title']}")
+    st.write(f"**Summary:** {article['Summary']}")
+    st.write(f"**Sentiment:** {article['Sentiment']}")
+    st.write(f"**Topics:** {', '.join(article['Topics'])}")
+
+
+def render_comparative(comparative_results):
+    """Render the comparative sentiment block."""
+    if not comparative_results:
+        return
+    st.subheader("📈 Comparative Sentiment Analysis Results")
+
+    # 🎯 Sentiment Distribution
+    sentiment_dist = comparative_results.get("Sentiment Distribution", {})
+    st.write("**Sentiment Distribution:**")
+    st.json(sentiment_dist)
+
+    # 🔎 Coverage Differences
+    coverage_diff = comparative_results.get("Coverage Differences", [])
+    st.subheader("🔀 Coverage Differences")
+    if isinstance(coverage_diff, list):
+        for diff in coverage_diff:
+            if isinstance(diff, dict):
+                st.markdown(
+                    f"""
+                    - **Comparison:** {diff.get('Comparison', 'No Comparison Available')}
+                    - **Impact:** {diff.get('Impact', 'No Impact Available')}
+                    """
+                )
+    else:
+        st.write("⚠️ No valid coverage differences found.")
+
+    # 🧠 Topic Overlap
+    topic_overlap = comparative_results.get("Topic Overlap", {})
+    if topic_overlap:
+        st.subheader("🔗 Topic Overlap")
+
+        common_topics = topic_overlap.get("Common Topics", [])
+        unique_article_1 = topic_overlap.get("Unique Topics in Article 1", [])
+        unique_article_2 = topic_overlap.get("Unique Topics in Article 2", [])
+
+        st.markdown(
+            f"""
+            - **Common Topics:** {', '.join(common_topics) if common_topics else 'None'}
+            - **Unique Topics in Article 1:** {', '.join(unique_article_1) if unique_article_1 else 'None'}
+            - **Unique Topics in Article 2:** {', '.join(unique_article_2) if unique_article_2 else 'None'}
+            """
+        )
+    else:
+        st.write("⚠️ No valid topic overlap information available.")
+
+
+def render_final(final):
+    """Render the final sentiment and the Hindi audio player."""
+    # 📝 Display Final Sentiment Analysis
+    st.subheader("💡 Final Sentiment Analysis")
+    final_sentiment = final.get("Final Sentiment Analysis", "No analysis available.")
+    st.write(f"**Summary:** {final_sentiment}")
+
+    # 🎙️ Hindi Text-to-Speech (TTS) Section
+    audio_url = final.get("Audio", "")
+
+    if audio_url:
+        st.subheader("🔊 Hindi Text-to-Speech Output")
+
+        # ✅ Construct the /tts/stream URL; playback starts on the first audio chunk
+        audio_url_absolute = f"https://rakeshrocky-1999-fast-api-tts.hf.space{audio_url}" # for hugging face
+        # audio_url_absolute = f"http://127.0.0.1:8000{audio_url}" #if you want audio from local machine
+
+        # 🎧 Stream audio directly from URL
+        st.audio(audio_url_absolute, format="audio/mp3")
+        st.success("✅ Audio is ready to play!")
+
+        # ⬇️ Provide download option for generated audio
+        st.markdown(
+            f"[⬇️ Download Audio File]({audio_url_absolute})",
+            unsafe_allow_html=True,
+        )
+    else:
+        st.warning("⚠️ No audio generated or file missing.")
+
+
 def main():
     """Streamlit UI for News Analysis, Sentiment Comparison, and Hindi TTS Application."""
     st.title("📰 News Analysis, Sentiment Comparison, and Hindi TTS Application")
@@ -26,100 +128,36 @@ def main():
     if st.button("🚀 Generate Analysis"):
         if company_name.strip():  # Validate non-empty input
             try:
-                # 🔄 Show a loading spinner while processing
-                with st.spinner("🔄 Generating analysis and audio... Please wait..."):
-                    # 📤 Send POST request to FastAPI
-                    response = requests.post(API_URL, json={"company_name": company_name.strip()})
-
-                if response.status_code == 200:
-                    result = response.json()
+                # 📤 Send POST request to FastAPI and render each part as it is streamed back
+                # 🎧 stream_audio: the API returns a streaming URL instead of waiting for the MP3
+                with requests.post(
+                    STREAM_API_URL,
+                    json={"company_name": company_name.strip(), "stream_audio": True},
+                    stream=True,
+                ) as response:
+                    if response.status_code != 200:
+                        st.error(f"❌ Error processing the request. HTTP Status: {response.status_code}")
+                        st.write(response.text)
+                        return
 
                     # ✅ Display extracted articles and sentiment
                     st.subheader(f"📚 News Analysis for: {company_name}")
-                    articles = result.get("Articles", [])
-                    for idx, article in enumerate(articles, start=1):
-                        st.write(f"### 📝 Article {idx}")
-                        st.write(f"**Title:** {article['Title']}")
-                        st.write(f"**Summary:** {article['Summary']}")
-                        st.write(f"**Sentiment:** {article['Sentiment']}")
-                        st.write(f"**Topics:** {', '.join(article['Topics'])}")
-
-                    # 📊 Display Comparative Sentiment Analysis
-                    comparative_results = result.get("Comparative Sentiment Score", {})
-                    if comparative_results:
-                        st.subheader("📈 Comparative Sentiment Analysis Results")
-
-                        # 🎯 Sentiment Distribution
-                        sentiment_dist = comparative_results.get("Sentiment Distribution", {})
-                        st.write("**Sentiment Distribution:**")
-                        st.json(sentiment_dist)
-
-                        # 🔎 Coverage Differences
-                        coverage_diff = comparative_results.get("Coverage Differences", [])
-                        st.subheader("🔀 Coverage Differences")
-                        if isinstance(coverage_diff, list):
-                            for diff in coverage_diff:
-                                if isinstance(diff, dict):
-                                    st.markdown(
-                                        f"""
-                                        - **Comparison:** {diff.get('Comparison', 'No Comparison Available')}
-                                        - **Impact:** {diff.get('Impact', 'No Impact Available')}
-                                        """
-                                    )
-                        else:
-                            st.write("⚠️ No valid coverage differences found.")
-
-                        # 🧠 Topic Overlap
-                        topic_overlap = comparative_results.get("Topic Overlap", {})
-                        if topic_overlap:
-                            st.subheader("🔗 Topic Overlap")
-
-                            common_topics = topic_overlap.get("Common Topics", [])
-                            unique_article_1 = topic_overlap.get("Unique Topics in Article 1", [])
-                            unique_article_2 = topic_overlap.get("Unique Topics in Article 2", [])
-
-                            st.markdown(
-                                f"""
-                                - **Common Topics:** {', '.join(common_topics) if common_topics else 'None'}
-                                - **Unique Topics in Article 1:** {', '.join(unique_article_1) if unique_article_1 else 'None'}
-                                - **Unique Topics in Article 2:** {', '.join(unique_article_2) if unique_article_2 else 'None'}
-                                """
-                            )
-                        else:
-                            st.write("⚠️ No valid topic overlap information available.")
-
-                    # 📝 Display Final Sentiment Analysis
-                    st.subheader("💡 Final Sentiment Analysis")
-                    final_sentiment = result.get("Final Sentiment Analysis", "No analysis available.")
-                    st.write(f"**Summary:** {final_sentiment}")
-
-                    # 🎙️ Hindi Text-to-Speech (TTS) Section
-                    audio_url = result.get("Audio", "")
-
-                    if audio_url:
-                        st.subheader("🔊 Hindi Text-to-Speech Output")
-
-                        # ✅ Construct audio URL from FastAPI's /output directory
-                        audio_url_absolute = f"https://rakeshrocky-1999-fast-api-tts.hf.space{audio_url}" # for hugging face
-                        # audio_url_absolute = f"http://127.0.0.1:8000{audio_url}" #if you want audio from local machine
-
-                        # ⏰ Add delay to ensure audio file is ready before loading
-                        time.sleep(2)
-
-                        # 🎧 Stream audio directly from URL
-                        st.audio(audio_url_absolute, format="audio/mp3")
-                        st.success("✅ Audio generated successfully!")
-
-                        # ⬇️ Provide download option for generated audio
-                        st.markdown(
-                            f"[⬇️ Download Audio File]({audio_url_absolute})",
-                            unsafe_allow_html=True,
-                        )
-                    else:
-                        st.warning("⚠️ No audio generated or file missing.")
-                else:
-                    st.error(f"❌ Error processing the request. HTTP Status: {response.status_code}")
-                    st.write(response.text)
+                    status = st.empty()
+                    status.info("🔄 Analyzing articles... results appear as they are ready")
+
+                    for event, data in read_events(response):
+                        if event == "article":
+                            render_article(data)
+                        elif event == "comparative":
+                            status.info("🔄 Preparing final sentiment and audio...")
+                            render_comparative(data)
+                        elif event == "final":
+                            status.empty()
+                            render_final(data)
+                        elif event == "error":
+                            status.empty()
+                            st.error(f"❌ Error processing the request. HTTP Status: {data['status_code']}")
+                            st.write(data["detail"])
 
             except requests.exceptions.RequestException as e:
                 st.error(f"⚠️ Error connecting to the API: {e}")
@@ -0,0 +1,212 @@
+"""Offline batch mode: analyze every company in a file and write one JSON line per company.
+
+Runs the same extract_news -> summarize -> analyze_sentiment ->
+generate_comparative_analysis pipeline as the API, without audio. Companies
+are processed in chunks: NewsAPI pages for upcoming companies are fetched by
+a bounded thread pool while the current chunk's articles are summarized and
+scored together as one batch.
+
+Results are appended to `--out` as soon as each chunk finishes. Rerunning the
+same command after a crash skips companies already in the file. Companies
+whose news could not be fetched (rate limits, timeouts, NewsAPI errors), or
+whose articles all failed to summarize, are not written, so the next run
+retries them.
+
+Usage: python batch.py companies.txt --out results.jsonl [--cache-dir DIR] [--news-concurrency 4]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from models import summarizer
+from models.comparative_analysis import generate_comparative_analysis
+from models.sentiment import analyze_sentiment_batch, summarize_sentiment
+from utils.scraper import DEFAULT_MAX_ARTICLES, DEFAULT_PAGE_SIZE, extract_news
+
+
+def read_companies(path):
+    """Company names from a text file: one per line, skipping blanks, `#` comments and repeats."""
+    companies = []
+    seen = set()
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            name = line.split("#", 1)[0].strip()
+            if name and name.lower() not in seen:
+                seen.add(name.lower())
+                companies.append(name)
+    return companies
+
+
+def completed_companies(out_path):
+    """Companies already written to `out_path`.
+
+    A line cut short by a crash is truncated away so appending resumes cleanly.
+    """
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+
+    valid_bytes = 0
+    with open(out_path, "rb") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            done.add(record["Company"].lower())
+            valid_bytes += len(line)
+
+    if valid_bytes < os.path.getsize(out_path):
+        print(f"⚠️ Dropping an incomplete last record from {out_path}")
+        with open(out_path, "r+b") as file:
+            file.truncate(valid_bytes)
+    return done
+
+
+def fetch_company_news(company, page_size, max_articles):
+    """`(company, articles)`, with articles None when NewsAPI could not be reached."""
+    try:
+        return company, extract_news(company, page_size, max_articles, raise_errors=True)
+    except Exception:
+        return company, None
+
+
+def analyze_chunk(chunk, batch_size):
+    """Summarize and score all articles of several companies together.
+
+    Returns one record per company, and the companies left out because the
+    model failed on every one of their articles.
+    """
+    contents = [article for _, articles in chunk for article in articles]
+    summaries = summarizer.summarize_batch(contents, batch_size=batch_size)
+    sentiments = analyze_sentiment_batch(summaries)
+
+    records = []
+    unsummarized = []
+    position = 0
+    for company, articles in chunk:
+        if not articles:
+            records.append({"Company": company, "Articles": [], "Error": "No articles found"})
+            continue
+        if all(summary == summarizer.ERROR_SUMMARY for summary in summaries[position:position + len(articles)]):
+            unsummarized.append(company)
+            position += len(articles)
+            continue
+
+        article_data = [
+            {
+                "Title": article.split(":")[0],
+                "Summary": summaries[position + i],
+                "Sentiment": sentiments[position + i]["label"].lower(),
+                "Polarity": round(sentiments[position + i]["polarity"], 4),
+                "Topics": ["General"],
+            }
+            for i, article in enumerate(articles)
+        ]
+        position += len(articles)
+
+        records.append(
+            {
+                "Company": company,
+                "Articles": article_data,
+                "Comparative Sentiment Score": generate_comparative_analysis(article_data),
+                "Final Sentiment Analysis": summarize_sentiment(
+                    company, [article["Sentiment"] for article in article_data]
+                ),
+            }
+        )
+    return records, unsummarized
+
+
+def run(
+    companies_file,
+    out_path,
+    chunk_size=32,
+    batch_size=16,
+    news_concurrency=4,
+    page_size=DEFAULT_PAGE_SIZE,
+    max_articles=DEFAULT_MAX_ARTICLES,
+):
+    companies = read_companies(companies_file)
+    done = completed_companies(out_path)
+    pending = [company for company in companies if company.lower() not in done]
+    print(f"📋 {len(companies)} companies, {len(companies) - len(pending)} already done, {len(pending)} to go")
+    if not pending:
+        return 0
+
+    start = time.perf_counter()
+    processed = 0
+    failed = []
+    unsummarized = []
+    with ThreadPoolExecutor(max_workers=news_concurrency, thread_name_prefix="news") as executor, open(
+        out_path, "a", encoding="utf-8"
+    ) as out:
+        # Results come back in input order while later companies are still being fetched
+        fetched = executor.map(lambda company: fetch_company_news(company, page_size, max_articles), pending)
+
+        chunk = []
+        for company, articles in fetched:
+            if articles is None:
+                failed.append(company)
+            else:
+                chunk.append((company, articles))
+            if len(chunk) < chunk_size and processed + len(failed) + len(chunk) < len(pending):
+                continue
+            if not chunk:
+                continue
+
+            records, chunk_unsummarized = analyze_chunk(chunk, batch_size)
+            unsummarized.extend(chunk_unsummarized)
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+
+            processed += len(chunk)
+            chunk = []
+            elapsed = time.perf_counter() - start
+            print(f"✅ {processed}/{len(pending)} companies ({processed / elapsed * 60:.1f} companies/min)")
+
+    elapsed = time.perf_counter() - start
+    written = processed - len(unsummarized)
+    print(f"🏁 Wrote {written} companies to {out_path} in {elapsed:.1f}s ({written / elapsed * 60:.1f} companies/min)")
+    if failed:
+        print(f"⚠️ Could not fetch news for {len(failed)} companies; rerun to retry them: {', '.join(failed)}")
+    if unsummarized:
+        print(f"⚠️ Could not summarize {len(unsummarized)} companies; rerun to retry them: {', '.join(unsummarized)}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("companies", help="text file with one company name per line")
+    parser.add_argument("--out", required=True, help="JSONL file to append results to")
+    parser.add_argument("--cache-dir", help="summary cache directory (default: SUMMARY_CACHE_DIR)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="companies summarized together")
+    parser.add_argument("--batch-size", type=int, default=16, help="texts per summarization forward pass")
+    parser.add_argument("--news-concurrency", type=int, default=4, help="concurrent NewsAPI requests")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--max-articles", type=int, default=DEFAULT_MAX_ARTICLES)
+    args = parser.parse_args()
+
+    if args.cache_dir is not None:
+        summarizer.configure_summary_cache(cache_dir=args.cache_dir)
+    summarizer.warm_up()
+
+    run(
+        args.companies,
+        args.out,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        news_concurrency=args.news_concurrency,
+        page_size=args.page_size,
+        max_articles=args.max_articles,
+    )
+
+
+if __name__ == "__main__":
+    main()
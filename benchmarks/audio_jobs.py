@@ -0,0 +1,99 @@
+"""Compare /process latency with TTS inline vs. as a background audio job.
+
+Starts the NewsAPI stub and `uvicorn api:app` twice, once with AUDIO_JOBS=0 and
+once with AUDIO_JOBS=1. The offline `silent` TTS backend takes `--latency`
+seconds per sentence. Each run sends concurrent /process requests for distinct
+companies and reports analysis latency. In job mode it also reports when the
+audio was ready, by polling /jobs/{id}.
+
+Usage: python -m benchmarks.audio_jobs [--requests 20] [--concurrency 5] [--latency 1.0] [--port 8768]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.load_test import percentile
+from benchmarks.newsapi_stub import start_stub_server
+from benchmarks.worker_memory import wait_for_health
+
+
+def wait_for_audio(base_url, job, start):
+    """Seconds from `start` until the job's audio is ready, or None if it did not finish."""
+    while True:
+        status = requests.get(base_url + job["status_url"], timeout=10).json()["status"]
+        if status == "done":
+            return time.perf_counter() - start
+        if status in ("failed", "rejected"):
+            return None
+        time.sleep(0.05)
+
+
+def timed_process(base_url, company):
+    start = time.perf_counter()
+    result = requests.post(f"{base_url}/process", json={"company_name": company}, timeout=600).json()
+    analysis = time.perf_counter() - start
+    job = result.get("Audio Job")
+    audio = wait_for_audio(base_url, job, start) if job else analysis
+    return analysis, audio
+
+
+def measure(label, audio_jobs, news_url, requests_count, concurrency, latency, port):
+    env = dict(os.environ)
+    env.update(
+        {
+            "NEWSAPI_URL": news_url,
+            "AUDIO_JOBS": audio_jobs,
+            "TTS_BACKEND": "silent",
+            "TTS_SILENT_LATENCY": str(latency),
+            "TTS_AUDIO_CACHE": "0",
+            "PROCESS_REUSE_SECONDS": "0",
+        }
+    )
+    api = subprocess.Popen([sys.executable, "-m", "uvicorn", "api:app", "--port", str(port)], env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for_health(port)
+        # Load the models before timing anything
+        timed_process(base_url, f"warm up {label}")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(
+                executor.map(lambda i: timed_process(base_url, f"{label} company {i}"), range(requests_count))
+            )
+    finally:
+        api.send_signal(signal.SIGINT)
+        api.wait()
+
+    analysis = [result[0] for result in results]
+    audio = [result[1] for result in results if result[1] is not None]
+    print(
+        f"{label:<12} {percentile(analysis, 50):>14.2f} {percentile(analysis, 95):>14.2f} "
+        f"{percentile(audio, 95) if audio else float('nan'):>15.2f} {len(results) - len(audio):>9}"
+    )
+
+
+def run(requests_count, concurrency, latency, port):
+    server, news_url = start_stub_server()
+    try:
+        print(f"{requests_count} requests, concurrency {concurrency}, {latency:.2f}s TTS per sentence")
+        print(f"{'mode':<12} {'analysis p50':>14} {'analysis p95':>14} {'audio ready p95':>15} {'no audio':>9}")
+        measure("inline", "0", news_url, requests_count, concurrency, latency, port)
+        measure("audio jobs", "1", news_url, requests_count, concurrency, latency, port)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.latency, args.port)
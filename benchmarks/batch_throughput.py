@@ -0,0 +1,81 @@
+"""Companies per minute for `batch.py` on a fixture corpus, plus a crash/resume check.
+
+Writes a companies file, starts the NewsAPI stub, and runs `python batch.py`
+once to completion. It then runs it again into a new file, kills it partway,
+and reruns it; the resumed file must hold every company exactly once.
+
+Usage: python -m benchmarks.batch_throughput [--companies 200] [--latency 0.05] [--news-concurrency 4]
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import COMPANIES
+from benchmarks.newsapi_stub import start_stub_server
+
+
+def batch_command(companies_file, out_path, news_concurrency):
+    return [
+        sys.executable, "batch.py", companies_file, "--out", out_path,
+        "--cache-dir", "", "--news-concurrency", str(news_concurrency),
+    ]
+
+
+def count_lines(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as file:
+        return sum(1 for _ in file)
+
+
+def run(count, latency, news_concurrency):
+    server, news_url = start_stub_server(latency=latency)
+    env = dict(os.environ, NEWSAPI_URL=news_url, NEWS_CACHE_TTL="0")
+
+    with tempfile.TemporaryDirectory() as directory:
+        companies_file = os.path.join(directory, "companies.txt")
+        with open(companies_file, "w", encoding="utf-8") as file:
+            file.writelines(f"{COMPANIES[i % len(COMPANIES)]} {i}\n" for i in range(count))
+
+        try:
+            # Uninterrupted run; includes model load, as a nightly job would
+            out_path = os.path.join(directory, "results.jsonl")
+            start = time.perf_counter()
+            subprocess.run(batch_command(companies_file, out_path, news_concurrency), env=env, check=True)
+            elapsed = time.perf_counter() - start
+
+            # Kill a second run once a third of the companies are written, then resume it
+            resumed_path = os.path.join(directory, "resumed.jsonl")
+            process = subprocess.Popen(batch_command(companies_file, resumed_path, news_concurrency), env=env)
+            while process.poll() is None and count_lines(resumed_path) < count // 3:
+                time.sleep(0.05)
+            process.send_signal(signal.SIGKILL)
+            process.wait()
+            written_before_crash = count_lines(resumed_path)
+            subprocess.run(batch_command(companies_file, resumed_path, news_concurrency), env=env, check=True)
+
+            with open(resumed_path, encoding="utf-8") as file:
+                companies = [json.loads(line)["Company"] for line in file]
+        finally:
+            server.shutdown()
+
+    print(f"\n{count} companies, {latency:.2f}s NewsAPI latency, {news_concurrency} concurrent NewsAPI calls")
+    print(f"Throughput: {count / elapsed * 60:.1f} companies/min ({elapsed:.1f}s total)")
+    print(
+        f"Resume: killed after {written_before_crash} companies; final file has {len(companies)} records, "
+        f"{len(set(companies))} unique ({'OK' if len(set(companies)) == len(companies) == count else 'MISMATCH'})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--news-concurrency", type=int, default=4)
+    args = parser.parse_args()
+    run(args.companies, args.latency, args.news_concurrency)
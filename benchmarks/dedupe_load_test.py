@@ -0,0 +1,79 @@
+"""Show that upstream and model work stay flat as duplicate /process concurrency grows.
+
+Starts the NewsAPI stub and `uvicorn api:app`, then fires bursts of identical
+concurrent requests. For each burst it reports NewsAPI calls and summarization
+jobs, which should stay at one pipeline's worth regardless of concurrency.
+
+Usage: python -m benchmarks.dedupe_load_test [--levels 1 5 10 25 50] [--port 8766]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.newsapi_stub import start_stub_server
+from benchmarks.worker_memory import wait_for_health
+
+
+def summarizer_jobs(base_url):
+    return requests.get(f"{base_url}/stats", timeout=10).json()["summarizer_batching"]["jobs"]
+
+
+def run(levels, port):
+    server, news_url = start_stub_server(latency=0.2)
+    env = dict(os.environ)
+    env.update(
+        {
+            "NEWSAPI_URL": news_url,
+            # Disable the other caches so only request deduplication is measured
+            "NEWS_CACHE_TTL": "0",
+            "SUMMARY_CACHE_DIR": "",
+            "PROCESS_REUSE_SECONDS": "0",
+        }
+    )
+    api = subprocess.Popen([sys.executable, "-m", "uvicorn", "api:app", "--port", str(port)], env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for_health(port)
+        print(f"{'duplicates':>10} {'NewsAPI calls':>14} {'summaries':>10} {'wall time (s)':>14}")
+        for level in levels:
+            # A fresh company per burst so earlier bursts can't be reused
+            company = f"Tesla {level}"
+            news_before = server.RequestHandlerClass.request_count
+            jobs_before = summarizer_jobs(base_url)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as executor:
+                statuses = list(
+                    executor.map(
+                        lambda _: requests.post(
+                            f"{base_url}/process", json={"company_name": company}, timeout=600
+                        ).status_code,
+                        range(level),
+                    )
+                )
+            elapsed = time.perf_counter() - start
+
+            failed = sum(1 for status in statuses if status != 200)
+            print(
+                f"{level:>10} {server.RequestHandlerClass.request_count - news_before:>14} "
+                f"{summarizer_jobs(base_url) - jobs_before:>10} {elapsed:>14.2f}"
+                + (f"  ({failed} failed)" if failed else "")
+            )
+    finally:
+        api.send_signal(signal.SIGINT)
+        api.wait()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    run(args.levels, args.port)
@@ -0,0 +1,68 @@
+import random
+import string
+
+COMPANIES = ["Tesla", "Apple", "Microsoft", "Amazon", "Nvidia", "Google", "Meta", "Intel"]
+
+HEADLINES = [
+    "{company} shares jump after quarterly earnings beat expectations",
+    "{company} faces new regulatory scrutiny over data practices",
+    "{company} announces layoffs as demand slows in key markets",
+    "{company} unveils new product line at annual developer event",
+    "Analysts split on {company} outlook amid supply chain concerns",
+    "{company} expands manufacturing footprint with new factory",
+]
+
+DESCRIPTIONS = [
+    "The company reported revenue growth across most segments, while executives warned "
+    "that rising costs and currency headwinds could weigh on margins later this year.",
+    "Regulators said they would examine whether the company complied with existing rules, "
+    "a process that could take months and may result in fines or operational changes.",
+    "Investors reacted cautiously to the announcement, with several analysts noting that "
+    "the long-term strategy remains intact despite short-term pressure on the stock.",
+    "The move is expected to create thousands of jobs and strengthen the company's position "
+    "against competitors that have been investing heavily in the same markets.",
+]
+
+
+def news_items(count, seed=0):
+    """Generate NewsAPI-shaped `title: description` strings for benchmarks."""
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        company = rng.choice(COMPANIES)
+        title = rng.choice(HEADLINES).format(company=company)
+        description = " ".join(rng.sample(DESCRIPTIONS, rng.randint(1, len(DESCRIPTIONS))))
+        items.append(f"{title}: {description}")
+    return items
+
+
+def summaries(count, duplicate_rate=0.1, seed=0, edits="words"):
+    """Generate varied summary strings, with a share of near-duplicate (syndicated) copies.
+
+    `edits="words"` copies swap a few whole words, like the same wire story run
+    by two outlets. `edits="chars"` makes shorter summaries whose copies have a
+    character replaced every few letters, like OCR or transliteration noise.
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted({word.strip(".,'") for text in HEADLINES + DESCRIPTIONS for word in text.split()})
+    vocabulary = [word for word in vocabulary if "{" not in word]
+    word_counts = (30, 60) if edits == "words" else (8, 20)
+
+    items = []
+    for _ in range(count):
+        if items and rng.random() < duplicate_rate:
+            if edits == "words":
+                words = rng.choice(items).split()
+                for _ in range(max(1, len(words) // 20)):
+                    words[rng.randrange(len(words))] = rng.choice(vocabulary)
+                items.append(" ".join(words))
+            else:
+                chars = list(rng.choice(items))
+                step = rng.randint(4, 6)
+                for index in range(rng.randrange(step), len(chars), step):
+                    chars[index] = rng.choice(string.ascii_lowercase)
+                items.append("".join(chars))
+            continue
+        words = [rng.choice(COMPANIES)] + [rng.choice(vocabulary) for _ in range(rng.randint(*word_counts))]
+        items.append(" ".join(words))
+    return items
@@ -0,0 +1,63 @@
+"""Measure TLS handshake savings and retry behaviour of the pooled scraper client.
+
+Runs the NewsAPI stub over HTTPS with a throwaway certificate (requires the
+`openssl` CLI) and compares a fresh `requests.get` per call with the scraper's
+shared session.
+
+Usage: python -m benchmarks.http_client [--requests 50]
+"""
+import argparse
+import tempfile
+import time
+
+import requests
+
+from benchmarks.newsapi_stub import make_self_signed_cert, start_stub_server
+from utils import scraper
+
+PARAMS = {"q": "Tesla", "pageSize": 5, "page": 1}
+
+
+def run(total):
+    with tempfile.TemporaryDirectory() as directory:
+        certfile = make_self_signed_cert(directory)
+        server, url = start_stub_server(certfile=certfile)
+        scraper.session.verify = certfile
+        # Otherwise REQUESTS_CA_BUNDLE from the environment takes precedence over session.verify
+        scraper.session.trust_env = False
+        try:
+            start = time.perf_counter()
+            for _ in range(total):
+                requests.get(url, params=PARAMS, verify=certfile, timeout=10).json()
+            unpooled = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(total):
+                scraper.fetch_json(url, PARAMS)
+            pooled = time.perf_counter() - start
+            stats = scraper.http_stats()
+        finally:
+            server.shutdown()
+
+        print(f"{total} HTTPS requests")
+        print(f"  new connection per request: {unpooled:.3f}s ({unpooled / total * 1000:.1f} ms/request, {total} handshakes)")
+        print(
+            f"  pooled session:             {pooled:.3f}s ({pooled / total * 1000:.1f} ms/request, "
+            f"{stats['new_connections']} handshakes, reuse ratio {stats['connection_reuse_ratio']:.2f})"
+        )
+
+        # Two injected 503s are retried with backoff before the request succeeds
+        server, url = start_stub_server(certfile=certfile, fail_first=2)
+        try:
+            before = scraper.http_stats()["retries"]
+            scraper.fetch_json(url, PARAMS)
+            print(f"  retries after two injected 503s: {scraper.http_stats()['retries'] - before}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    run(args.requests)
@@ -0,0 +1,110 @@
+"""Sweep uvicorn workers x inference threads per worker: requests/sec and p95 latency.
+
+For each combination, starts `uvicorn api:app --workers W` with WEB_CONCURRENCY=W
+and INFERENCE_THREADS=T against the NewsAPI stub, warms every worker up, then
+runs the /process load test with a new company per request so every request
+summarizes. `auto` threads divide the usable cores evenly between workers,
+which is the default. Run it on the machine you are sizing; other load skews it.
+
+Usage: python -m benchmarks.inference_threads [--workers 1 2 4] [--threads auto 1 2 4] [--affinity] [--requests 40]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.load_test import percentile
+from benchmarks.load_test import run as load_test
+from benchmarks.newsapi_stub import start_stub_server
+from benchmarks.worker_memory import wait_for_health
+from models.inference_threads import usable_cpus
+
+
+def measure(workers, threads, affinity, requests_count, concurrency, port, news_url, round_id):
+    env = dict(os.environ)
+    env.update(
+        {
+            "NEWSAPI_URL": news_url,
+            "NEWS_CACHE_TTL": "0",
+            "SUMMARY_CACHE_DIR": "",
+            "PROCESS_REUSE_SECONDS": "0",
+            "AUDIO_JOBS": "1",
+            "TTS_BACKEND": "silent",
+            "WEB_CONCURRENCY": str(workers),
+            "INFERENCE_CPU_AFFINITY": "1" if affinity else "0",
+        }
+    )
+    env.pop("SUMMARIZER_SOCKET", None)
+    if threads == "auto":
+        env.pop("INFERENCE_THREADS", None)
+    else:
+        env["INFERENCE_THREADS"] = threads
+
+    url = f"http://127.0.0.1:{port}"
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--workers", str(workers)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_health(port)
+        # Enough concurrent requests that every worker loads its model before timing
+        with ThreadPoolExecutor(max_workers=workers * 2) as executor:
+            list(
+                executor.map(
+                    lambda i: requests.post(f"{url}/process", json={"company_name": f"warm up {i}"}, timeout=600),
+                    range(workers * 4),
+                )
+            )
+        companies = [f"Company {round_id}-{i}" for i in range(requests_count)]
+        start = time.perf_counter()
+        latencies, errors = load_test(url, concurrency, requests_count, companies)
+        elapsed = time.perf_counter() - start
+    finally:
+        api.send_signal(signal.SIGINT)
+        api.wait()
+    return latencies, errors, elapsed
+
+
+def run(workers_list, threads_list, affinity, requests_count, concurrency, port):
+    server, news_url = start_stub_server()
+    rows = []
+    try:
+        for workers in workers_list:
+            for threads in threads_list:
+                print(f"\n▶ {workers} worker(s), {threads} thread(s) per worker")
+                rows.append(
+                    (workers, threads)
+                    + measure(workers, threads, affinity, requests_count, concurrency, port, news_url, len(rows))
+                )
+    finally:
+        server.shutdown()
+
+    print(f"\n{len(usable_cpus())} usable CPUs, {requests_count} requests at concurrency {concurrency}, "
+          f"CPU pinning {'on' if affinity else 'off'}")
+    print(f"{'workers':>7} {'threads':>7} {'req/s':>7} {'p50 (s)':>8} {'p95 (s)':>8} {'errors':>6}")
+    for workers, threads, latencies, errors, elapsed in rows:
+        if not latencies:
+            print(f"{workers:>7} {threads:>7} {'-':>7} {'-':>8} {'-':>8} {errors:>6}")
+            continue
+        print(
+            f"{workers:>7} {threads:>7} {len(latencies) / elapsed:>7.2f} {percentile(latencies, 50):>8.2f} "
+            f"{percentile(latencies, 95):>8.2f} {errors:>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", nargs="+", default=["auto", "1", "2", "4"])
+    parser.add_argument("--affinity", action="store_true", help="pin each worker to its own cores")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8770)
+    args = parser.parse_args()
+    run(args.workers, args.threads, args.affinity, args.requests, args.concurrency, args.port)
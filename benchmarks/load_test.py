@@ -0,0 +1,62 @@
+"""Concurrent load test for the `/process` endpoint.
+
+Usage: python -m benchmarks.load_test [--url http://127.0.0.1:8000] [--concurrency 10] [--requests 50]
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.fixtures import COMPANIES
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def timed_request(session, url, company):
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{url}/process", json={"company_name": company}, timeout=600)
+        ok = response.status_code == 200
+    except requests.RequestException:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run(url, concurrency, total, companies):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(
+            executor.map(lambda i: timed_request(session, url, companies[i % len(companies)]), range(total))
+        )
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, ok in results if ok]
+    errors = sum(1 for _, ok in results if not ok)
+    print(f"requests: {total}  concurrency: {concurrency}  errors: {errors}")
+    print(f"throughput: {total / elapsed:.2f} req/s")
+    if latencies:
+        print(
+            f"latency p50: {percentile(latencies, 50):.2f}s  p95: {percentile(latencies, 95):.2f}s  "
+            f"mean: {statistics.mean(latencies):.2f}s  max: {max(latencies):.2f}s"
+        )
+    return latencies, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--companies", nargs="+", default=COMPANIES)
+    args = parser.parse_args()
+    run(args.url.rstrip("/"), args.concurrency, args.requests, args.companies)
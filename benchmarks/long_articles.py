@@ -0,0 +1,100 @@
+"""Latency and memory of long-article summarization: truncation vs. chunked map-reduce.
+
+Builds articles of roughly 1k/5k/20k tokens from fixture sentences. The
+"truncate" row is one generate call that cuts the input at the model's limit,
+which is what summarization did before chunking. The "map-reduce" row is
+generate_summaries(), which splits on sentence boundaries, summarizes the
+chunks in one batch and then summarizes their summaries. Each measurement runs
+in its own process so the peak RSS growth belongs to that run alone.
+
+Usage: python -m benchmarks.long_articles [--tokens 1000 5000 20000] [--batch-size 8]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.fixtures import news_items
+from benchmarks.worker_memory import rss_mb
+
+
+def build_article(tokenizer, tokens):
+    """Fixture sentences joined until the article is about `tokens` tokens long."""
+    sentences = []
+    count = 0
+    seed = 0
+    while count < tokens:
+        item = news_items(1, seed=seed)[0].replace(": ", ". ")
+        sentences.append(item)
+        count += len(tokenizer(item, add_special_tokens=False)["input_ids"])
+        seed += 1
+    return " ".join(sentences)
+
+
+def measure(tokens, mode, batch_size):
+    """Time one summary of a `tokens`-token article and sample this process's RSS meanwhile."""
+    from models import summarizer
+
+    tokenizer = summarizer.get_summarizer().tokenizer
+    article = build_article(tokenizer, tokens)
+    # Warm up so the measurement doesn't include lazy initialization
+    summarizer.generate_summaries(["Warm up the summarization model."])
+
+    budget = summarizer.chunk_budget(tokenizer)
+    chunks = summarizer.split_into_chunks(article, tokenizer, budget, max_chunks=max(1, summarizer.SUMMARY_MAX_CALLS - 1))
+    calls = 1 if mode == "truncate" or len(chunks) == 1 else len(chunks) + 1
+
+    baseline = rss_mb(os.getpid())
+    peak = [baseline]
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(0.01):
+            peak[0] = max(peak[0], rss_mb(os.getpid()))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    if mode == "truncate":
+        summary = summarizer._generate([article], 150, 50)[0]
+    else:
+        summary = summarizer.generate_summaries([article], batch_size=batch_size)[0]
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+
+    print(json.dumps({"seconds": elapsed, "peak_mb": peak[0] - baseline, "calls": calls, "ok": summary != summarizer.ERROR_SUMMARY}))
+
+
+def run(sizes, batch_size):
+    env = dict(os.environ, SUMMARY_CACHE_DIR="")
+    print(f"{'tokens':>7} {'mode':<11} {'generate inputs':>15} {'latency (s)':>12} {'peak RSS +MB':>13} {'ok':>4}")
+    for tokens in sizes:
+        for mode in ("truncate", "map-reduce"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.long_articles", "--measure", str(tokens), mode, "--batch-size", str(batch_size)],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{tokens:>7} {mode:<11} {result['calls']:>15} {result['seconds']:>12.2f} "
+                f"{result['peak_mb']:>13.0f} {'yes' if result['ok'] else 'no':>4}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--measure", nargs=2, metavar=("TOKENS", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        measure(int(args.measure[0]), args.measure[1], args.batch_size)
+    else:
+        run(args.tokens, args.batch_size)
@@ -0,0 +1,110 @@
+"""Exercise the NewsAPI response cache against the local stub.
+
+Shows request coalescing (N concurrent identical queries -> one upstream call),
+fresh hits, and stale-while-revalidate serving a stale page instantly while a
+background refresh runs. Then repeats the concurrent queries from several
+processes sharing one disk cache, like uvicorn workers, and exits non-zero
+unless they too cost a single upstream call.
+
+Usage: python -m benchmarks.news_cache [--concurrency 20] [--latency 0.3] [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.newsapi_stub import start_stub_server
+from utils import scraper
+from utils.cache import DiskCache, LRUCache
+
+
+def timed_extract(company):
+    start = time.perf_counter()
+    scraper.extract_news(company)
+    return time.perf_counter() - start
+
+
+def use_cache_dir(directory, url):
+    scraper.NEWSAPI_URL = url
+    scraper.news_memory_cache = LRUCache(max_items=512)
+    scraper.news_disk_cache = DiskCache(os.path.join(directory, "news.sqlite3"))
+    scraper.NEWS_CACHE_TTL = 60.0
+
+
+def worker_queries(directory, url, company, concurrency, ready):
+    """One "uvicorn worker": `concurrency` identical queries at once."""
+    use_cache_dir(directory, url)
+    ready.wait()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(scraper.extract_news, [company] * concurrency))
+    return scraper.news_cache_stats()["waited_on_other_worker"]
+
+
+def run_workers(workers, concurrency, latency):
+    """Return True if identical queries from `workers` processes cost one upstream call."""
+    server, url = start_stub_server(latency=latency)
+    context = multiprocessing.get_context("spawn")
+    try:
+        with tempfile.TemporaryDirectory() as directory, context.Manager() as manager:
+            ready = manager.Event()
+            with context.Pool(workers) as pool:
+                results = [
+                    pool.apply_async(worker_queries, (directory, url, "Nvidia", concurrency, ready))
+                    for _ in range(workers)
+                ]
+                # Let every process import and open the cache before the queries start together
+                time.sleep(2)
+                ready.set()
+                waited = sum(result.get() for result in results)
+        calls = server.RequestHandlerClass.request_count
+        print(
+            f"{workers} workers x {concurrency} concurrent identical queries: {calls} upstream call(s), "
+            f"{waited} worker(s) waited on another's fetch"
+        )
+        return calls == 1
+    finally:
+        server.shutdown()
+
+
+def run(concurrency, latency):
+    server, url = start_stub_server(latency=latency)
+    scraper.NEWSAPI_URL = url
+    with tempfile.TemporaryDirectory() as directory:
+        use_cache_dir(directory, url)
+        scraper.NEWS_CACHE_TTL = 1.0
+        scraper.NEWS_CACHE_STALE = 60.0
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                latencies = list(executor.map(timed_extract, ["Tesla"] * concurrency))
+            print(
+                f"{concurrency} concurrent identical queries: {server.RequestHandlerClass.request_count} upstream call(s), "
+                f"slowest {max(latencies):.2f}s"
+            )
+
+            print(f"fresh hit: {timed_extract('Tesla') * 1000:.1f} ms")
+
+            time.sleep(scraper.NEWS_CACHE_TTL + 0.1)
+            stale = timed_extract("tesla")
+            time.sleep(latency + 0.2)
+            print(
+                f"stale hit: {stale * 1000:.1f} ms (background refresh -> "
+                f"{server.RequestHandlerClass.request_count} upstream calls total)"
+            )
+            print(scraper.news_cache_stats())
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, default=4, help="processes sharing the disk cache")
+    args = parser.parse_args()
+    run(args.concurrency, args.latency)
+    if not run_workers(args.workers, args.concurrency, args.latency):
+        print("❌ Workers sharing the cache made more than one upstream call")
+        sys.exit(1)
@@ -0,0 +1,128 @@
+"""Local stub of the NewsAPI `/v2/everything` endpoint for benchmarks.
+
+Serves deterministic articles with NewsAPI's response shape and paging
+semantics (`page`, `pageSize`, `totalResults`), with optional per-request latency,
+injected 503s and TLS.
+
+Usage: python -m benchmarks.newsapi_stub [--port 8081] [--total 100] [--latency 0.2]
+"""
+import argparse
+import json
+import ssl
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import DESCRIPTIONS, HEADLINES
+
+
+class NewsAPIStubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive
+    protocol_version = "HTTP/1.1"
+    # Avoid delayed-ACK stalls between the header and body writes on kept-alive connections
+    disable_nagle_algorithm = True
+    total_results = 100
+    latency = 0.0
+    fail_first = 0
+    request_count = 0
+    _count_lock = threading.Lock()
+
+    def do_GET(self):
+        with self._count_lock:
+            type(self).request_count += 1
+            request_number = type(self).request_count
+
+        if request_number <= self.fail_first:
+            self._send(503, {"status": "error", "code": "unavailable"})
+            return
+
+        url = urlparse(self.path)
+        if url.path != "/v2/everything":
+            self._send(404, {"status": "error", "code": "notFound"})
+            return
+
+        params = parse_qs(url.query)
+        query = params.get("q", [""])[0]
+        page = int(params.get("page", ["1"])[0])
+        page_size = int(params.get("pageSize", ["100"])[0])
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        start = (page - 1) * page_size
+        articles = [
+            {
+                "source": {"id": None, "name": f"Stub Source {n % 7}"},
+                "title": HEADLINES[n % len(HEADLINES)].format(company=query) + f" ({n})",
+                "description": DESCRIPTIONS[n % len(DESCRIPTIONS)],
+                "url": f"https://example.com/{query}/{n}",
+                "publishedAt": "2024-01-01T00:00:00Z",
+            }
+            for n in range(start, min(start + page_size, self.total_results))
+        ]
+        self._send(200, {"status": "ok", "totalResults": self.total_results, "articles": articles})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_self_signed_cert(directory):
+    """Create a throwaway certificate for 127.0.0.1 with the openssl CLI; returns its path."""
+    certfile = f"{directory}/stub-cert.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+            "-keyout", certfile, "-out", certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile
+
+
+def start_stub_server(total_results=100, latency=0.0, port=0, fail_first=0, certfile=None):
+    """Start the stub in a background thread; returns `(server, everything_url)`.
+
+    With `certfile` (a PEM holding key and certificate) the stub serves HTTPS.
+    """
+    handler = type(
+        "StubHandler",
+        (NewsAPIStubHandler,),
+        {"total_results": total_results, "latency": latency, "fail_first": fail_first, "request_count": 0},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    scheme = "http"
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/v2/everything"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--total", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.total, args.latency, args.port)
+    print(f"📰 NewsAPI stub serving {args.total} articles at {url} (set NEWSAPI_URL to use it)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
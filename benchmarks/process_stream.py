@@ -0,0 +1,89 @@
+"""Time to first article: /process vs. the /process/stream server-sent events.
+
+Starts the NewsAPI stub (with `--page-latency` per page) and `uvicorn api:app`,
+then for each run requests a fresh company from both endpoints. /process shows
+nothing until the whole response arrives. For /process/stream it reports when
+the first article, the comparative block and the final event arrived.
+
+Usage: python -m benchmarks.process_stream [--runs 5] [--articles 10] [--page-size 5] [--port 8769]
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+from benchmarks.newsapi_stub import start_stub_server
+from benchmarks.worker_memory import wait_for_health
+
+
+def time_process(session, base_url, body):
+    start = time.perf_counter()
+    session.post(f"{base_url}/process", json=body, timeout=600).raise_for_status()
+    return time.perf_counter() - start
+
+
+def time_stream(session, base_url, body):
+    """Seconds until the first event of each kind arrived."""
+    start = time.perf_counter()
+    arrived = {}
+    with session.post(f"{base_url}/process/stream", json=body, stream=True, timeout=600) as response:
+        response.raise_for_status()
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                arrived.setdefault(line.partition(":")[2].strip(), time.perf_counter() - start)
+    return arrived
+
+
+def run(runs, articles, page_size, page_latency, port):
+    server, news_url = start_stub_server(total_results=articles, latency=page_latency)
+    env = dict(os.environ)
+    env.update(
+        {
+            "NEWSAPI_URL": news_url,
+            # Every request fetches from NewsAPI; summaries miss because each run uses a new company
+            "NEWS_CACHE_TTL": "0",
+            "SUMMARY_CACHE_DIR": "",
+            "PROCESS_REUSE_SECONDS": "0",
+        }
+    )
+    api = subprocess.Popen([sys.executable, "-m", "uvicorn", "api:app", "--port", str(port)], env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    session = requests.Session()
+    try:
+        wait_for_health(port)
+        # Load the models before timing anything
+        time_process(session, base_url, {"company_name": "warm up"})
+
+        totals, streams = [], []
+        for i in range(runs):
+            body = {"company_name": f"Tesla {i}", "max_articles": articles, "page_size": page_size}
+            totals.append(time_process(session, base_url, body))
+            streams.append(time_stream(session, base_url, {**body, "company_name": f"Tesla stream {i}"}))
+    finally:
+        api.send_signal(signal.SIGINT)
+        api.wait()
+        server.shutdown()
+
+    print(f"{runs} runs, {articles} articles in pages of {page_size}, {page_latency:.2f}s NewsAPI latency per page")
+    print(f"{'first result shown':<32} {'median (s)':>11}")
+    print(f"{'/process (whole response)':<32} {statistics.median(totals):>11.2f}")
+    for event in ("article", "comparative", "final"):
+        values = [arrived[event] for arrived in streams if event in arrived]
+        if values:
+            print(f"{'/process/stream ' + event:<32} {statistics.median(values):>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--articles", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=5)
+    parser.add_argument("--page-latency", type=float, default=0.3)
+    parser.add_argument("--port", type=int, default=8769)
+    args = parser.parse_args()
+    run(args.runs, args.articles, args.page_size, args.page_latency, args.port)
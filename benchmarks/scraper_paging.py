@@ -0,0 +1,57 @@
+"""Check `extract_news` paging against the local NewsAPI stub and time page streaming.
+
+Usage: python -m benchmarks.scraper_paging [--latency 0.3]
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.newsapi_stub import start_stub_server
+from utils import scraper
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def run(latency):
+    server, url = start_stub_server(total_results=23, latency=latency)
+    scraper.NEWSAPI_URL = url
+    # Measure real paging, not the response cache
+    scraper.NEWS_CACHE_TTL = 0
+    results = []
+    try:
+        results.append(check("default depth returns 5 articles", len(scraper.extract_news("Tesla")) == 5))
+        results.append(
+            check(
+                "max_articles=12 with page_size=5 returns 12 articles",
+                len(scraper.extract_news("Tesla", page_size=5, max_articles=12)) == 12,
+            )
+        )
+
+        pages = [len(page) for page in scraper.iter_news_pages("Tesla", page_size=10, max_articles=100)]
+        results.append(check(f"pages stop at totalResults (got {pages})", pages == [10, 10, 3]))
+
+        articles = scraper.extract_news("Tesla", page_size=4, max_articles=8)
+        results.append(check("articles are not repeated across pages", len(set(articles)) == 8))
+
+        # The first page is usable after one round trip rather than after all of them
+        start = time.perf_counter()
+        pages = scraper.iter_news_pages("Tesla", page_size=5, max_articles=20)
+        next(pages)
+        first_page = time.perf_counter() - start
+        list(pages)
+        all_pages = time.perf_counter() - start
+        print(f"⏱️ first page after {first_page:.2f}s, all 4 pages after {all_pages:.2f}s")
+    finally:
+        server.shutdown()
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+    sys.exit(run(args.latency))
@@ -0,0 +1,66 @@
+"""Compare per-call TextBlob sentiment against analyze_sentiment_batch.
+
+The per-call path is timed on up to `--sample` texts and extrapolated for
+larger sizes, since 100k TextBlob calls take minutes. Label and score
+agreement with TextBlob are reported on the same sample.
+
+Usage: python -m benchmarks.sentiment_batch [--sizes 1000 100000] [--sample 2000] [--transformer]
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import summaries
+from models.sentiment import analyze_sentiment_batch
+
+
+def per_call(texts):
+    # Imported here so the lexicon backend's timing doesn't include TextBlob's import
+    from textblob import TextBlob
+
+    return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+def run(sizes, sample, transformer):
+    # Warm up so the first measurement doesn't include lazy initialization
+    per_call(["warm up"])
+    analyze_sentiment_batch(["warm up"], backend="lexicon")
+    backends = ["lexicon"] + (["transformer"] if transformer else [])
+    for backend in backends[1:]:
+        analyze_sentiment_batch(["warm up"], backend=backend)
+
+    header = f"{'texts':>8} {'per-call TextBlob (s)':>22}"
+    header += "".join(f" {backend + ' (s)':>17} {'speedup':>8}" for backend in backends)
+    print(header)
+    for size in sizes:
+        texts = summaries(size, duplicate_rate=0.0, seed=size)
+
+        measured = texts[:sample]
+        start = time.perf_counter()
+        per_call(measured)
+        sequential = (time.perf_counter() - start) * size / len(measured)
+        row = f"{size:>8} {sequential:>21.2f}{'*' if len(measured) < size else ' '}"
+
+        for backend in backends:
+            start = time.perf_counter()
+            analyze_sentiment_batch(texts, backend=backend)
+            batched = time.perf_counter() - start
+            row += f" {batched:>17.2f} {sequential / batched:>7.1f}x"
+        print(row)
+    print("* extrapolated from a sample")
+
+    measured = summaries(sample, duplicate_rate=0.0, seed=1)
+    reference = analyze_sentiment_batch(measured, backend="textblob")
+    for backend in backends:
+        results = analyze_sentiment_batch(measured, backend=backend)
+        labels = sum(a["label"] == b["label"] for a, b in zip(results, reference)) / len(measured)
+        scores = sum(abs(a["polarity"] - b["polarity"]) < 1e-9 for a, b in zip(results, reference)) / len(measured)
+        print(f"{backend}: {labels:.1%} labels and {scores:.1%} polarity scores match TextBlob on {sample} texts")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--sample", type=int, default=2000)
+    parser.add_argument("--transformer", action="store_true", help="also time the transformer backend")
+    args = parser.parse_args()
+    run(args.sizes, args.sample, args.transformer)
@@ -0,0 +1,57 @@
+"""Measure `import api` time with `python -X importtime` and guard against regressions.
+
+Fails (exit code 1) if importing the API takes longer than the budget or pulls
+in any of the heavy model libraries that should only load on first use.
+
+Usage: python -m benchmarks.startup_time [--budget-ms 1500] [--top 10]
+"""
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ("transformers", "torch", "textblob", "googletrans", "gtts")
+
+
+def import_times(module):
+    """Return `(cumulative_us, name)` for every module imported by `import <module>`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.append((int(cumulative), name.strip()))
+    return times
+
+
+def run(budget_ms, top):
+    times = import_times("api")
+    total_ms = next(cumulative for cumulative, name in times if name == "api") / 1000
+
+    print(f"import api: {total_ms:.0f} ms (budget {budget_ms} ms)")
+    print("Slowest imports (cumulative):")
+    for cumulative, name in sorted(times, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    heavy = sorted({name for _, name in times if name.split(".")[0] in HEAVY_MODULES})
+    failed = False
+    if heavy:
+        print(f"❌ Heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if total_ms > budget_ms:
+        print(f"❌ Startup import time over budget by {total_ms - budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(run(args.budget_ms, args.top))
@@ -0,0 +1,46 @@
+"""Compare per-article summarization against summarize_batch.
+
+Each pass starts from its own empty, memory-only summary cache, so both
+measure model calls rather than cache hits.
+
+Usage: python -m benchmarks.summarize_batch [--sizes 5 20 100] [--batch-size 8]
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import news_items
+from models import summarizer
+
+
+def timed_pass(function):
+    cache = summarizer.configure_summary_cache(cache_dir="")
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    assert cache.memory_hits + cache.disk_hits == 0, "a pass was served from the summary cache"
+    return elapsed
+
+
+def run(sizes, batch_size):
+    configured_cache = summarizer.summary_cache
+    try:
+        # Warm up so the first measurement doesn't include lazy initialization
+        timed_pass(lambda: summarizer.summarize_batch(news_items(2, seed=-1), batch_size=batch_size))
+
+        print(f"{'articles':>8} {'per-article (s)':>16} {'batched (s)':>12} {'speedup':>8}")
+        for size in sizes:
+            # Distinct texts, so neither pass can reuse a summary within the pass either
+            texts = list(dict.fromkeys(news_items(size * 2)))[:size]
+            sequential = timed_pass(lambda: [summarizer.summarize(text) for text in texts])
+            batched = timed_pass(lambda: summarizer.summarize_batch(texts, batch_size=batch_size))
+            print(f"{size:>8} {sequential:>16.2f} {batched:>12.2f} {sequential / batched:>7.2f}x")
+    finally:
+        summarizer.summary_cache = configured_cache
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+    run(args.sizes, args.batch_size)
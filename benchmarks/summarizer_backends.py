@@ -0,0 +1,109 @@
+"""Quality vs. speed of the summarizer backends on a fixture set.
+
+Loads each backend in turn with one shared tokenizer and summarizes the same
+fixture articles in batches. It reports input and generated tokens per second,
+plus ROUGE-1 and ROUGE-L F1 against the fp32 `torch` summaries. A backend that
+cannot load (e.g. `onnx` without optimum installed) is skipped with the reason.
+
+Usage: python -m benchmarks.summarizer_backends [--articles 32] [--batch-size 8] [--backends torch torch-int8 onnx]
+"""
+import argparse
+import gc
+import time
+from collections import Counter
+
+from benchmarks.fixtures import news_items
+from models.summarizer import SUMMARIZER_MODEL, SUMMARIZER_REVISION
+from models.summarizer_backends import SUMMARIZER_BACKENDS, load_summarizer, load_tokenizer
+
+
+def rouge_1(reference, candidate):
+    """Unigram-overlap F1."""
+    ref, cand = Counter(reference.lower().split()), Counter(candidate.lower().split())
+    overlap = sum((ref & cand).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / sum(cand.values()), overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_l(reference, candidate):
+    """Longest-common-subsequence F1 over words."""
+    ref, cand = reference.lower().split(), candidate.lower().split()
+    if not ref or not cand:
+        return 0.0
+    previous = [0] * (len(cand) + 1)
+    for word in ref:
+        current = [0]
+        for j, other in enumerate(cand):
+            current.append(previous[j] + 1 if word == other else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(cand), lcs / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def summarize_all(pipe, texts, batch_size):
+    summaries = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        results = pipe(batch, max_length=150, min_length=50, do_sample=False, truncation=True, batch_size=len(batch))
+        summaries.extend(result["summary_text"] for result in results)
+    return summaries
+
+
+def run(count, batch_size, backends):
+    tokenizer = load_tokenizer(SUMMARIZER_MODEL, SUMMARIZER_REVISION)
+    texts = news_items(count, seed=7)
+    input_tokens = sum(len(ids) for ids in tokenizer(texts)["input_ids"])
+
+    reference = None
+    print(f"{count} articles, {input_tokens} input tokens, batch size {batch_size}, model {SUMMARIZER_MODEL}")
+    print(f"{'backend':<11} {'load (s)':>9} {'run (s)':>8} {'in tok/s':>9} {'out tok/s':>10} {'ROUGE-1':>8} {'ROUGE-L':>8}")
+    for backend in backends:
+        start = time.perf_counter()
+        try:
+            pipe = load_summarizer(SUMMARIZER_MODEL, SUMMARIZER_REVISION, backend=backend, tokenizer=tokenizer)
+        except Exception as e:
+            print(f"{backend:<11} skipped: {e}")
+            continue
+        loaded = time.perf_counter() - start
+
+        # Warm up so the first batch doesn't include lazy initialization
+        summarize_all(pipe, texts[:1], 1)
+        start = time.perf_counter()
+        summaries = summarize_all(pipe, texts, batch_size)
+        elapsed = time.perf_counter() - start
+        output_tokens = sum(len(ids) for ids in tokenizer(summaries)["input_ids"])
+
+        if reference is None and backend == "torch":
+            reference = summaries
+        if reference is not None:
+            r1 = sum(map(rouge_1, reference, summaries)) / count
+            rl = sum(map(rouge_l, reference, summaries)) / count
+            quality = f"{r1:>8.3f} {rl:>8.3f}"
+        else:
+            quality = f"{'n/a':>8} {'n/a':>8}"
+        print(
+            f"{backend:<11} {loaded:>9.1f} {elapsed:>8.2f} {input_tokens / elapsed:>9.0f} "
+            f"{output_tokens / elapsed:>10.0f} {quality}"
+        )
+
+        del pipe
+        gc.collect()
+
+    if reference is None:
+        print("ROUGE needs the `torch` backend in --backends as the fp32 reference")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--backends", nargs="+", choices=list(SUMMARIZER_BACKENDS), default=list(SUMMARIZER_BACKENDS))
+    args = parser.parse_args()
+    # The fp32 reference runs first so every other backend is compared against it
+    backends = sorted(args.backends, key=lambda backend: backend != "torch")
+    run(args.articles, args.batch_size, backends)
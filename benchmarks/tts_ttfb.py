@@ -0,0 +1,109 @@
+"""Time to first audio byte for the Streamlit flow, before and after /tts/stream.
+
+Starts the NewsAPI stub and `uvicorn api:app` with the offline `silent` TTS
+backend, which takes `--latency` seconds per sentence (like one gTTS request
+per segment). Each run uses a fresh company and disables the audio and
+response caches so every request synthesizes.
+
+- before: POST /process waits for the MP3 file, the app sleeps 2 s, then GETs it
+- after:  POST /process with stream_audio, then GET the /tts/stream URL
+
+A second table streams a multi-sentence text and compares the first byte with
+the last, which is when a file-based response could have started.
+
+Usage: python -m benchmarks.tts_ttfb [--runs 5] [--latency 0.3] [--port 8767]
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+from benchmarks.newsapi_stub import start_stub_server
+from benchmarks.worker_memory import wait_for_health
+
+# What app.py used to sleep before loading the audio URL
+APP_AUDIO_DELAY = 2.0
+LONG_TEXT = " ".join(
+    [
+        "Tesla shares rose after the earnings report.",
+        "Regulators opened a review of its data practices.",
+        "Analysts expect margins to stay under pressure.",
+        "The company plans a new factory next year.",
+    ]
+)
+
+
+def first_and_last_byte(session, url, start):
+    """Seconds from `start` until the first and the last body byte of a GET."""
+    first = None
+    with session.get(url, stream=True, timeout=600) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=None):
+            if chunk and first is None:
+                first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def flow_before(session, base_url, company):
+    start = time.perf_counter()
+    result = session.post(f"{base_url}/process", json={"company_name": company}, timeout=600).json()
+    time.sleep(APP_AUDIO_DELAY)
+    return first_and_last_byte(session, base_url + result["Audio"], start)[0]
+
+
+def flow_after(session, base_url, company):
+    start = time.perf_counter()
+    result = session.post(
+        f"{base_url}/process", json={"company_name": company, "stream_audio": True}, timeout=600
+    ).json()
+    return first_and_last_byte(session, base_url + result["Audio"], start)[0]
+
+
+def run(runs, latency, port):
+    server, news_url = start_stub_server()
+    env = dict(os.environ)
+    env.update(
+        {
+            "NEWSAPI_URL": news_url,
+            "TTS_BACKEND": "silent",
+            "TTS_SILENT_LATENCY": str(latency),
+            "TTS_AUDIO_CACHE": "0",
+            "PROCESS_REUSE_SECONDS": "0",
+        }
+    )
+    api = subprocess.Popen([sys.executable, "-m", "uvicorn", "api:app", "--port", str(port)], env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    session = requests.Session()
+    try:
+        wait_for_health(port)
+        # Load the models before timing anything
+        session.post(f"{base_url}/process", json={"company_name": "warm up"}, timeout=600)
+
+        before = [flow_before(session, base_url, f"Tesla before {i}") for i in range(runs)]
+        after = [flow_after(session, base_url, f"Tesla after {i}") for i in range(runs)]
+        print(f"Time to first audio byte over {runs} runs, {latency:.2f}s synthesis per sentence")
+        print(f"{'flow':<34} {'median (s)':>11} {'max (s)':>9}")
+        print(f"{'before: file + 2s app delay':<34} {statistics.median(before):>11.2f} {max(before):>9.2f}")
+        print(f"{'after: /tts/stream':<34} {statistics.median(after):>11.2f} {max(after):>9.2f}")
+
+        stream_url = f"{base_url}/tts/stream?" + requests.compat.urlencode({"text": LONG_TEXT})
+        first, last = first_and_last_byte(session, stream_url, time.perf_counter())
+        print(f"\n/tts/stream, 4 sentences: first byte {first:.2f}s, complete {last:.2f}s")
+    finally:
+        api.send_signal(signal.SIGINT)
+        api.wait()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+    run(args.runs, args.latency, args.port)
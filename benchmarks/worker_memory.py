@@ -0,0 +1,92 @@
+"""Report per-worker and total RSS with and without the shared inference server.
+
+Starts `uvicorn api:app --workers N` twice: once with every worker loading its
+own summarizer, once with the workers pointed at `models.inference_server`.
+
+Usage: python -m benchmarks.worker_memory [--workers 4] [--port 8765]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import requests
+
+
+def rss_mb(pid):
+    """Resident set size of a process in MB, read from /proc."""
+    with open(f"/proc/{pid}/status") as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def children(pid):
+    """Direct child pids of a process."""
+    pids = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as file:
+            pids.extend(int(child) for child in file.read().split())
+    return pids
+
+
+def wait_for_health(port, timeout=600):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    raise TimeoutError("API did not become healthy")
+
+
+def measure(workers, port, socket_path=None):
+    env = dict(os.environ)
+    env.pop("SUMMARIZER_SOCKET", None)
+    server = None
+    if socket_path:
+        env["SUMMARIZER_SOCKET"] = socket_path
+        server = subprocess.Popen(
+            [sys.executable, "-m", "models.inference_server", "--socket", socket_path], env=env
+        )
+        while not os.path.exists(socket_path):
+            time.sleep(0.5)
+
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--workers", str(workers)],
+        env=env,
+    )
+    try:
+        wait_for_health(port)
+        # Give every worker time to finish importing
+        time.sleep(5)
+        worker_rss = [rss_mb(pid) for pid in children(api.pid)]
+        server_rss = rss_mb(server.pid) if server else 0.0
+        return worker_rss, server_rss
+    finally:
+        for process in (api, server):
+            if process:
+                process.send_signal(signal.SIGINT)
+                process.wait()
+
+
+def report(label, worker_rss, server_rss):
+    total = sum(worker_rss) + server_rss
+    per_worker = ", ".join(f"{rss:.0f}" for rss in worker_rss)
+    print(f"{label:<22} workers [{per_worker}] MB | server {server_rss:.0f} MB | total {total:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", default="/tmp/summarizer-bench.sock")
+    args = parser.parse_args()
+
+    report("model per worker", *measure(args.workers, args.port))
+    report("shared model server", *measure(args.workers, args.port, args.socket))
@@ -0,0 +1,120 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+
+class BatchScheduler:
+    """Collect jobs from concurrent callers and run them through `batch_fn` together.
+
+    `batch_fn(items, **params)` must return one result per item, in order. Jobs are
+    only batched with other jobs that share the same keyword params.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=16, max_wait_ms=10, name="batch-scheduler"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._jobs = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def submit(self, item, **params):
+        """Queue a single job and return a Future for its result."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, params, future, time.perf_counter()))
+        return future
+
+    def submit_many(self, items, **params):
+        """Queue several jobs with the same params and return their Futures in order."""
+        return [self.submit(item, **params) for item in items]
+
+    def stats(self):
+        """Return queue depth, batch-size histogram and wait-time metrics."""
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "jobs": self._jobs,
+                "batches": sum(self._batch_sizes.values()),
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "avg_wait_ms": round(self._wait_total / self._jobs * 1000, 3) if self._jobs else 0.0,
+                "max_wait_ms_observed": round(self._wait_max * 1000, 3),
+            }
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        """Block for the first job, then gather more until the batch is full or the wait expires."""
+        jobs = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(jobs) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    jobs.append(self._queue.get(timeout=remaining))
+                else:
+                    # Still drain jobs that are already waiting
+                    jobs.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def _run(self):
+        while True:
+            try:
+                jobs = self._collect()
+
+                # Group by params so each batch_fn call uses one generation setting
+                groups = {}
+                for job in jobs:
+                    groups.setdefault(tuple(sorted(job[1].items())), []).append(job)
+
+                for group in groups.values():
+                    self._dispatch(group)
+            except Exception as e:
+                # This is the only worker; if it died, every later submission would hang
+                print(f"⚠️ {self.name} failed to dispatch a batch: {e}")
+
+    def _dispatch(self, group):
+        # Callers may have cancelled their futures (e.g. on client disconnect) while queued
+        group = [job for job in group if job[2].set_running_or_notify_cancel()]
+        if not group:
+            return
+
+        started = time.perf_counter()
+        waits = [started - queued_at for _, _, _, queued_at in group]
+        with self._stats_lock:
+            self._batch_sizes[len(group)] += 1
+            self._jobs += len(group)
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, *waits)
+
+        try:
+            results = self.batch_fn([item for item, _, _, _ in group], **group[0][1])
+        except Exception as e:
+            for _, _, future, _ in group:
+                future.set_exception(e)
+            return
+
+        for (_, _, future, _), result in zip(group, results):
+            future.set_result(result)
+
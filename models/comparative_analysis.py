@@ -97,9 +97,27 @@
 
 import json
 import os
+import tempfile
+import zlib
 from collections import Counter
 from difflib import SequenceMatcher
 
+import numpy as np
+
+# Summaries are considered different if their SequenceMatcher ratio is below 70%
+SIMILARITY_THRESHOLD = 0.7
+
+# Pairs whose character-shingle cosine similarity is below this are treated as
+# different without the exact diff. This is an approximate cut-off, not a bound:
+# it was calibrated on word-level edits (syndicated copies with a few words
+# swapped), where every pair reaching SIMILARITY_THRESHOLD scored well above it.
+# Short summaries with a character edit every few letters can still reach the
+# ratio below it and be reported as different. 0 diffs every pair the length
+# bound allows, which matches the all-pairs SequenceMatcher result exactly.
+CANDIDATE_THRESHOLD = float(os.getenv("COMPARISON_CANDIDATE_THRESHOLD", "0.45"))
+SHINGLE_SIZE = 4
+VECTOR_DIM = 4096
+
 
 def calculate_sentiment_distribution(article_data):
     """Calculate sentiment distribution from articles."""
@@ -109,20 +127,81 @@ def calculate_sentiment_distribution(article_data):
     return dict(sentiment_counter)
 
 
+def describe_difference(summary1, summary2, article_index_1, article_index_2):
+    """Human-readable description of two differing summaries."""
+    if not summary1 or not summary2:
+        return f"Article {article_index_1 + 1} or {article_index_2 + 1} has no summary."
+    return (
+        f"Article {article_index_1 + 1}: {summary1[:50]}... "
+        f"vs. Article {article_index_2 + 1}: {summary2[:50]}..."
+    )
+
+
 def compare_articles(summary1, summary2, article_index_1=0, article_index_2=1):
     """Compare summaries to identify key differences."""
     if not summary1 or not summary2:
-        return f"Article {article_index_1 + 1} or {article_index_2 + 1} has no summary."
-    
+        return describe_difference(summary1, summary2, article_index_1, article_index_2)
+
     similarity_ratio = SequenceMatcher(None, summary1, summary2).ratio()
-    if similarity_ratio < 0.7:  # Considered different if similarity is below 70%
-        return (
-            f"Article {article_index_1 + 1}: {summary1[:50]}... "
-            f"vs. Article {article_index_2 + 1}: {summary2[:50]}..."
-        )
+    if similarity_ratio < SIMILARITY_THRESHOLD:
+        return describe_difference(summary1, summary2, article_index_1, article_index_2)
     return None
 
 
+def shingle_vectors(texts):
+    """L2-normalized hashed character n-gram count vectors, one row per text."""
+    vectors = np.zeros((len(texts), VECTOR_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        normalized = " ".join(text.lower().split())
+        shingles = [normalized[i:i + SHINGLE_SIZE] for i in range(max(len(normalized) - SHINGLE_SIZE + 1, 1))]
+        buckets = [zlib.crc32(shingle.encode("utf-8")) % VECTOR_DIM for shingle in shingles if shingle]
+        np.add.at(vectors[row], buckets, 1.0)
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def find_coverage_differences(summaries, candidate_threshold=None):
+    """Return the `(i, j)` pairs, i < j, whose summaries differ, in row-major order.
+
+    Pairs the SequenceMatcher length bound rules out are different for certain.
+    Of the rest, only pairs with a shingle cosine of at least `candidate_threshold`
+    (CANDIDATE_THRESHOLD by default) are diffed; see CANDIDATE_THRESHOLD for how
+    far that cut-off can be trusted.
+    """
+    if candidate_threshold is None:
+        candidate_threshold = CANDIDATE_THRESHOLD
+    count = len(summaries)
+    if count < 2:
+        return []
+
+    empty = np.array([not summary for summary in summaries])
+    lengths = np.array([len(summary) for summary in summaries], dtype=np.float64)
+    vectors = shingle_vectors(summaries)
+    similarity = vectors @ vectors.T
+
+    # Upper bound on SequenceMatcher.ratio() from lengths alone (its real_quick_ratio)
+    total = lengths[:, None] + lengths[None, :]
+    length_bound = 2 * np.minimum(lengths[:, None], lengths[None, :]) / np.where(total == 0, 1, total)
+
+    pairs = np.triu(np.ones((count, count), dtype=bool), k=1)
+    candidates = (
+        pairs
+        & ~empty[:, None]
+        & ~empty[None, :]
+        & (similarity >= candidate_threshold)
+        & (length_bound >= SIMILARITY_THRESHOLD)
+    )
+    different = pairs & ~candidates
+
+    for i, j in zip(*np.nonzero(candidates)):
+        if SequenceMatcher(None, summaries[i], summaries[j]).ratio() < SIMILARITY_THRESHOLD:
+            different[i, j] = True
+
+    return [(int(i), int(j)) for i, j in zip(*np.nonzero(different))]
+
+
 def compare_topics(topics_1, topics_2):
     """Compare article topics to find common and unique topics."""
     topics_1_set = set(topics_1) if topics_1 else set()
@@ -139,41 +218,39 @@ def compare_topics(topics_1, topics_2):
     }
 
 
-def generate_comparative_analysis(article_data, output_file):
-    """Generate comparative sentiment analysis and topic overlap."""
-    coverage_differences = []
-    topic_overlap_info = {"Common Topics": set(), "Unique Topics": set()}
-
-    for i in range(len(article_data) - 1):
-        for j in range(i + 1, len(article_data)):
-            article_1 = article_data[i]
-            article_2 = article_data[j]
-
-            # Compare articles for summary differences
-            diff_summary = compare_articles(
-                article_1.get("Summary", ""), article_2.get("Summary", ""), i, j
-            )
-            diff_topics = compare_topics(
-                article_1.get("Topics", []), article_2.get("Topics", [])
-            )
-
-            if diff_summary:
-                coverage_differences.append(
-                    {
-                        "Comparison": diff_summary,
-                        "Impact": (
-                            "Potential impact on public perception due to differences in focus."
-                        ),
-                    }
-                )
-
-            # Update topic overlap correctly
-            if diff_topics["Common Topics"]:
-                topic_overlap_info["Common Topics"].update(diff_topics["Common Topics"])
-            if diff_topics["Unique Topics in Article 1"]:
-                topic_overlap_info["Unique Topics"].update(diff_topics["Unique Topics in Article 1"])
-            if diff_topics["Unique Topics in Article 2"]:
-                topic_overlap_info["Unique Topics"].update(diff_topics["Unique Topics in Article 2"])
+def calculate_topic_overlap(article_data):
+    """Union of pairwise topic comparisons, computed in one pass over the articles.
+
+    A topic is common if at least two articles share it, and unique if some
+    article has it while another article doesn't.
+    """
+    if len(article_data) < 2:
+        return set(), set()
+
+    topic_counts = Counter(
+        topic for article in article_data for topic in set(article.get("Topics", []) or [])
+    )
+    common_topics = {topic for topic, count in topic_counts.items() if count >= 2}
+    unique_topics = {topic for topic, count in topic_counts.items() if count < len(article_data)}
+    return common_topics, unique_topics
+
+
+def generate_comparative_analysis(article_data, output_file=None):
+    """Generate comparative sentiment analysis and topic overlap.
+
+    Returns the results; they are also saved to `output_file` when one is given.
+    """
+    summaries = [article.get("Summary", "") or "" for article in article_data]
+    coverage_differences = [
+        {
+            "Comparison": describe_difference(summaries[i], summaries[j], i, j),
+            "Impact": (
+                "Potential impact on public perception due to differences in focus."
+            ),
+        }
+        for i, j in find_coverage_differences(summaries)
+    ]
+    common_topics, unique_topics = calculate_topic_overlap(article_data)
 
     # Final results
     results = {
@@ -181,15 +258,19 @@ def generate_comparative_analysis(article_data, output_file):
         "Coverage Differences": coverage_differences
         or [{"Comparison": "No major differences found.", "Impact": "Neutral coverage."}],
         "Topic Overlap": {
-            "Common Topics": list(topic_overlap_info["Common Topics"])
-            if topic_overlap_info["Common Topics"]
-            else ["None"],
-            "Unique Topics": list(topic_overlap_info["Unique Topics"])
-            if topic_overlap_info["Unique Topics"]
-            else ["None"],
+            "Common Topics": list(common_topics) if common_topics else ["None"],
+            "Unique Topics": list(unique_topics) if unique_topics else ["None"],
         },
     }
 
+    if output_file:
+        save_comparative_analysis(results, output_file)
+
+    return results
+
+
+def save_comparative_analysis(results, output_file):
+    """Write results atomically so readers never see a partially written file."""
     # Ensure the directory exists before writing
     output_dir = os.path.dirname(output_file)
     if output_dir and not os.path.exists(output_dir):
@@ -197,8 +278,14 @@ def generate_comparative_analysis(article_data, output_file):
 
     # Save to output file with error handling
     try:
-        with open(output_file, "w", encoding="utf-8") as file:
-            json.dump(results, file, ensure_ascii=False, indent=4)
+        fd, temp_path = tempfile.mkstemp(dir=output_dir or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(results, file, ensure_ascii=False, indent=4)
+            os.replace(temp_path, output_file)
+        except BaseException:
+            os.remove(temp_path)
+            raise
     except PermissionError:
         raise PermissionError(f"Unable to write to {output_file}. Check file permissions.")
 
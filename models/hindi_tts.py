@@ -76,9 +76,17 @@
 #success running code using docker 
 
 import asyncio
-from googletrans import Translator
-from gtts import gTTS
+import hashlib
 import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from models.tts_backends import get_tts_backend
+from utils.cache import DiskCache, LRUCache, TieredCache
+from utils.metrics import STAGE_SECONDS, count_error, metrics, stage_timer
 
 # Get the base directory where the script is located
 base_dir = os.path.abspath(os.path.dirname(__file__))
@@ -89,6 +97,48 @@ output_dir = os.path.abspath(os.path.join(base_dir, "..", "output"))
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
+TTS_LANG = "hi"
+
+# Synthesis runs on its own bounded pool so slow TTS calls overlap without
+# starving the default executor used for translation and file I/O
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "8"))
+tts_executor = ThreadPoolExecutor(max_workers=TTS_MAX_CONCURRENCY, thread_name_prefix="tts")
+
+# Read size when streaming cached audio from disk
+STREAM_CHUNK_SIZE = 64 * 1024
+
+TRANSLATOR_TIMEOUT = float(os.getenv("TRANSLATOR_TIMEOUT", "10"))
+_translator = None
+_translator_lock = threading.Lock()
+
+# Translations are cached separately so an audio miss doesn't also cost a translation call
+TRANSLATION_CACHE_DIR = os.getenv(
+    "TRANSLATION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "cache", "translations")
+)
+translation_cache = TieredCache(
+    LRUCache(max_items=1024),
+    DiskCache(os.path.join(TRANSLATION_CACHE_DIR, "translations.sqlite3"), 16 * 1024 * 1024)
+    if TRANSLATION_CACHE_DIR
+    else None,
+)
+
+# Content-addressed audio store limits
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("TTS_AUDIO_CACHE_MAX_MB", "200")) * 1024 * 1024
+AUDIO_CACHE_MAX_AGE = float(os.getenv("TTS_AUDIO_CACHE_MAX_AGE_HOURS", "168")) * 3600
+
+_audio_stats_lock = threading.Lock()
+_audio_stats = {"hits": 0, "misses": 0, "evicted_files": 0}
+
+# How often the background janitor sweeps audio directories
+JANITOR_INTERVAL = float(os.getenv("TTS_JANITOR_INTERVAL", "300"))
+# Temp files older than this are leftovers from interrupted writes
+STALE_TEMP_AGE = 3600
+
+
+def _count_audio(name, amount=1):
+    with _audio_stats_lock:
+        _audio_stats[name] += amount
+
 
 # Generate Hindi TTS
 def generate_tts(text, output_path=None):
@@ -97,41 +147,233 @@ def generate_tts(text, output_path=None):
         return None
 
     try:
+        backend = get_tts_backend()
+
         # Set the correct output path if not provided
         if output_path is None:
-            output_path = os.path.join(output_dir, "hindi_tts_output.mp3")
-
-        # Generate and save the TTS
-        tts = gTTS(text=text, lang="hi")
-        tts.save(output_path)
+            output_path = unique_audio_path(output_dir)
+
+        # Generate the TTS into a temp file, then rename it into place so readers
+        # never see a partially written file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                backend.write_to_fp(text, TTS_LANG, file)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
 
         return output_path
     except Exception as e:
         print(f"❌ TTS generation failed: {e}")
+        count_error("tts")
         return None
 
 
+async def generate_tts_async(text, output_path=None):
+    """`generate_tts` on the TTS pool, so the event loop keeps serving while audio is synthesized."""
+    loop = asyncio.get_running_loop()
+    with stage_timer("tts"):
+        return await loop.run_in_executor(tts_executor, generate_tts, text, output_path)
+
+
+def translation_cache_key(text, dest=TTS_LANG):
+    return hashlib.sha256(f"{dest}|{text}".encode("utf-8")).hexdigest()
+
+
+def get_translator():
+    """Shared Translator; its HTTP client keeps connections to Google alive between calls."""
+    global _translator
+    if _translator is None:
+        with _translator_lock:
+            if _translator is None:
+                from googletrans import Translator
+
+                _translator = Translator(timeout=TRANSLATOR_TIMEOUT)
+    return _translator
+
+
 # Translate to Hindi - NOW ASYNC ✅
 async def translate_to_hindi(text):
     """Translate English text to Hindi using Google Translator."""
-    try:
-        loop = asyncio.get_event_loop()
-        translator = Translator()
-        # Run translation asynchronously
-        translation = await loop.run_in_executor(None, translator.translate, text, "hi")
-
-        if translation and translation.text:
-            return translation.text
-        else:
+    key = translation_cache_key(text)
+    with stage_timer("translate"):
+        cached = translation_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            loop = asyncio.get_running_loop()
+            translator = get_translator()
+            # Run translation asynchronously
+            translation = await loop.run_in_executor(None, translator.translate, text, TTS_LANG)
+
+            if translation and translation.text:
+                translation_cache.set(key, translation.text)
+                return translation.text
+            else:
+                count_error("translate")
+                return None
+        except Exception as e:
+            print(f"❌ Translation error: {e}")
+            count_error("translate")
             return None
+
+
+def audio_cache_path(hindi_text, cache_dir):
+    """Content-addressed location of the audio for a Hindi text and voice."""
+    voice = get_tts_backend().name
+    digest = hashlib.sha256(f"{voice}|{TTS_LANG}|{hindi_text}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.mp3")
+
+
+def unique_audio_path(directory):
+    """A per-request audio file name, so concurrent requests never share a file."""
+    return os.path.join(directory, f"hindi_tts_output_{uuid.uuid4().hex}.mp3")
+
+
+def evict_audio_files(directory, max_bytes=AUDIO_CACHE_MAX_BYTES, max_age=AUDIO_CACHE_MAX_AGE):
+    """Delete audio older than `max_age`, then the least recently used until under `max_bytes`."""
+    now = time.time()
+    entries = []
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+            if name.endswith(".tmp") and now - stat.st_mtime > STALE_TEMP_AGE:
+                os.remove(path)
+            elif name.endswith(".mp3"):
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except FileNotFoundError:
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for mtime, size, path in sorted(entries):
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            evicted += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+
+    _count_audio("evicted_files", evicted)
+    return evicted
+
+
+def start_audio_janitor(directories, interval=JANITOR_INTERVAL):
+    """Sweep the given audio directories in a background thread every `interval` seconds."""
+
+    def sweep():
+        while True:
+            for directory in directories:
+                try:
+                    evict_audio_files(directory)
+                except OSError as e:
+                    print(f"⚠️ Audio janitor failed for {directory}: {e}")
+            time.sleep(interval)
+
+    janitor = threading.Thread(target=sweep, name="audio-janitor", daemon=True)
+    janitor.start()
+    return janitor
+
+
+def tts_cache_stats():
+    with _audio_stats_lock:
+        audio = dict(_audio_stats)
+    return {"audio": audio, "translations": translation_cache.stats()}
+
+
+def _produce_audio_chunks(hindi_text, queue, loop, cancelled, cache_path=None):
+    """Run the backend's stream on a TTS thread, handing each chunk to the event loop.
+
+    With `cache_path` the chunks are also written to a temp file that is renamed
+    into the audio store once synthesis completes.
+    """
+    file = None
+    temp_path = None
+    start = time.perf_counter()
+    try:
+        if cache_path is not None:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+            file = os.fdopen(fd, "wb")
+
+        for chunk in get_tts_backend().stream(hindi_text, TTS_LANG):
+            if cancelled.is_set():
+                return
+            if file is not None:
+                file.write(chunk)
+            loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+        if file is not None:
+            file.close()
+            os.replace(temp_path, cache_path)
+            temp_path = None
     except Exception as e:
-        print(f"❌ Translation error: {e}")
-        return None
+        print(f"❌ TTS streaming failed: {e}")
+        count_error("tts")
+    finally:
+        # Runs on a TTS thread outside the request, so it is recorded without Server-Timing
+        metrics.observe(STAGE_SECONDS, time.perf_counter() - start, stage="tts")
+        if file is not None:
+            file.close()
+        if temp_path is not None:
+            os.remove(temp_path)
+        # None marks the end of the stream
+        loop.call_soon_threadsafe(queue.put_nowait, None)
+
+
+async def stream_tts(hindi_text, cache_dir=None):
+    """Yield MP3 bytes for a Hindi text as the backend synthesizes each segment.
+
+    With `cache_dir` a cached phrase is streamed from the audio store, and a new
+    one is saved there for later requests while it streams.
+    """
+    loop = asyncio.get_running_loop()
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = audio_cache_path(hindi_text, cache_dir)
+        if os.path.exists(cache_path):
+            os.utime(cache_path)
+            _count_audio("hits")
+            with open(cache_path, "rb") as file:
+                while True:
+                    chunk = await loop.run_in_executor(None, file.read, STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+        _count_audio("misses")
+        os.makedirs(cache_dir, exist_ok=True)
+
+    queue = asyncio.Queue()
+    cancelled = threading.Event()
+    loop.run_in_executor(tts_executor, _produce_audio_chunks, hindi_text, queue, loop, cancelled, cache_path)
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        # Stop synthesizing once the client has gone away
+        cancelled.set()
 
 
 # Process and Generate TTS
-async def process_and_generate_tts(text, audio_path=None):
-    """Translate and generate Hindi TTS, with optional audio path."""
+async def process_and_generate_tts(text, audio_path=None, cache_dir=None):
+    """Translate and generate Hindi TTS, with optional audio path.
+
+    With `cache_dir` (and no explicit `audio_path`) the audio is stored under a
+    content-addressed name, and a repeated phrase returns the existing file.
+    """
     if not text:
         return None
 
@@ -139,11 +381,23 @@ async def process_and_generate_tts(text, audio_path=None):
     hindi_text = await translate_to_hindi(text)
 
     if hindi_text:
+        use_cache = audio_path is None and cache_dir is not None
+        if use_cache:
+            audio_path = audio_cache_path(hindi_text, cache_dir)
+            if os.path.exists(audio_path):
+                # Refresh the mtime so eviction treats it as recently used
+                os.utime(audio_path)
+                _count_audio("hits")
+                return audio_path
+            _count_audio("misses")
+            os.makedirs(cache_dir, exist_ok=True)
+
         # Generate TTS and save it to specified path
         if audio_path is None:
-            audio_path = os.path.join(output_dir, "hindi_tts_output.mp3")
+            audio_path = unique_audio_path(output_dir)
 
-        audio_path = generate_tts(hindi_text, audio_path)
+        # Synthesis does blocking network I/O, so keep it off the event loop
+        audio_path = await generate_tts_async(hindi_text, audio_path)
 
         # Check if audio is saved successfully
         if audio_path and os.path.exists(audio_path):
@@ -152,5 +406,3 @@ async def process_and_generate_tts(text, audio_path=None):
             return None
     else:
         return None
-
-
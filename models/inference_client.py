@@ -0,0 +1,59 @@
+import threading
+import time
+from multiprocessing.connection import Client
+
+
+class RemoteSummarizer:
+    """Client for the shared inference server (see `models/inference_server.py`)."""
+
+    def __init__(self, socket_path, connect_timeout=120):
+        self.socket_path = socket_path
+        self.connect_timeout = connect_timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        # The server may still be loading the model when workers start
+        deadline = time.monotonic() + self.connect_timeout
+        delay = 0.1
+        while True:
+            try:
+                conn = Client(self.socket_path, family="AF_UNIX")
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+
+        self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def generate(self, texts, max_length=150, min_length=50):
+        """Summarize texts on the server; returns one summary per text."""
+        request = {"texts": list(texts), "max_length": max_length, "min_length": min_length}
+
+        # Retry once so a restarted server doesn't fail the request
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send(request)
+                response = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                self._reset()
+                if attempt:
+                    raise RuntimeError(f"Inference server unavailable: {e}") from e
+
+        if "error" in response:
+            raise RuntimeError(f"Inference server error: {response['error']}")
+        return response["summaries"]
@@ -0,0 +1,79 @@
+"""Shared inference process that owns the summarization model.
+
+API workers connect over a Unix socket (set `SUMMARIZER_SOCKET` in their
+environment) instead of each loading their own copy of the model. Requests from
+all workers go through one BatchScheduler, so they are batched together too.
+
+Usage: python -m models.inference_server [--socket /tmp/summarizer.sock]
+"""
+import argparse
+import os
+import threading
+from multiprocessing.connection import Listener
+
+DEFAULT_SOCKET = "/tmp/summarizer.sock"
+
+
+def handle_connection(conn, scheduler):
+    """Serve summarization requests from one API worker until it disconnects."""
+    with conn:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                return
+
+            try:
+                futures = scheduler.submit_many(
+                    request["texts"],
+                    max_length=request["max_length"],
+                    min_length=request["min_length"],
+                )
+                response = {"summaries": [future.result() for future in futures]}
+            except Exception as e:
+                response = {"error": str(e)}
+
+            try:
+                conn.send(response)
+            except (EOFError, OSError):
+                return
+
+
+def serve(socket_path=DEFAULT_SOCKET):
+    # This process must load the model itself rather than forward to another server
+    os.environ.pop("SUMMARIZER_SOCKET", None)
+    # It is the only process running the model, so its threads may use every core
+    os.environ["INFERENCE_WORKERS"] = "1"
+
+    from models.batching import BatchScheduler
+    from models.summarizer import generate_summaries, warm_up
+
+    # Load the model before accepting connections; clients retry until the socket exists
+    warm_up()
+
+    scheduler = BatchScheduler(
+        lambda texts, **params: generate_summaries(texts, batch_size=len(texts), **params),
+        max_batch_size=int(os.getenv("SUMMARY_BATCH_SIZE", "16")),
+        max_wait_ms=float(os.getenv("SUMMARY_BATCH_WAIT_MS", "10")),
+        name="inference-server-scheduler",
+    )
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    with Listener(socket_path, family="AF_UNIX") as listener:
+        os.chmod(socket_path, 0o600)
+        print(f"🧠 Inference server listening on {socket_path}")
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=handle_connection, args=(conn, scheduler), daemon=True).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=os.getenv("SUMMARIZER_SOCKET", DEFAULT_SOCKET))
+    args = parser.parse_args()
+    try:
+        serve(args.socket)
+    except KeyboardInterrupt:
+        print("🛑 Inference server stopped")
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import threading
+
+# Processes on this machine that each run the models: uvicorn's --workers (which reads
+# WEB_CONCURRENCY), or 1 behind the shared inference server
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS") or os.getenv("WEB_CONCURRENCY") or "1")
+# Intra-op threads per worker; unset divides the usable cores evenly between workers
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS") or "0")
+INFERENCE_INTEROP_THREADS = int(os.getenv("INFERENCE_INTEROP_THREADS", "1"))
+# Pin each worker to its own slice of cores so workers don't migrate onto each other's
+INFERENCE_CPU_AFFINITY = os.getenv("INFERENCE_CPU_AFFINITY", "0") == "1"
+
+SLOT_LOCK_DIR = os.path.join(tempfile.gettempdir(), "inference-slots")
+
+_settings = None
+_settings_lock = threading.Lock()
+# Held open for the life of the process; the lock marks its slot as taken
+_slot_file = None
+
+
+def usable_cpus():
+    """CPUs this process may run on, honouring container and taskset limits where the OS reports them."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    # macOS and Windows have no affinity API in os; assume every core is usable
+    return list(range(os.cpu_count() or 1))
+
+
+def can_pin():
+    """Whether this platform supports pinning all of a process's threads (Linux)."""
+    return hasattr(os, "sched_setaffinity") and os.path.isdir("/proc/self/task")
+
+
+def thread_settings(workers=None, threads=None, interop_threads=None, cpus=None):
+    """Intra-op and inter-op thread counts for one of `workers` processes sharing `cpus`."""
+    workers = max(1, workers or INFERENCE_WORKERS)
+    cpus = usable_cpus() if cpus is None else cpus
+    return {
+        "workers": workers,
+        "intra_op": threads or INFERENCE_THREADS or max(1, len(cpus) // workers),
+        "inter_op": interop_threads or INFERENCE_INTEROP_THREADS,
+    }
+
+
+def claim_slot(workers):
+    """Index of the first slot no other live process holds, from 0 to workers - 1."""
+    global _slot_file
+    # Unix only; callers check can_pin() first
+    import fcntl
+
+    os.makedirs(SLOT_LOCK_DIR, exist_ok=True)
+    for slot in range(workers):
+        file = open(os.path.join(SLOT_LOCK_DIR, f"slot-{slot}.lock"), "w")
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            continue
+        _slot_file = file
+        return slot
+    return None
+
+
+def pin_process(cpus):
+    """Restrict every thread of this process (and threads it starts later) to `cpus`."""
+    for tid in os.listdir("/proc/self/task"):
+        try:
+            os.sched_setaffinity(int(tid), cpus)
+        except OSError:
+            # The thread exited while we were iterating
+            pass
+
+
+def configure_inference_threads():
+    """Apply the per-worker thread (and optional CPU pinning) settings once, before a model loads."""
+    global _settings
+    if _settings is not None:
+        return _settings
+    with _settings_lock:
+        if _settings is not None:
+            return _settings
+
+        cpus = usable_cpus()
+        settings = thread_settings(cpus=cpus)
+        settings["cpus"] = None
+        if INFERENCE_CPU_AFFINITY and settings["workers"] > 1 and not can_pin():
+            print("⚠️ INFERENCE_CPU_AFFINITY is only supported on Linux; not pinning workers")
+        elif INFERENCE_CPU_AFFINITY and settings["workers"] > 1:
+            slot = claim_slot(settings["workers"])
+            if slot is None:
+                print("⚠️ No free CPU slot; more model processes are running than INFERENCE_WORKERS")
+            else:
+                per_worker = max(1, len(cpus) // settings["workers"])
+                pinned = cpus[slot * per_worker:(slot + 1) * per_worker] or cpus[-per_worker:]
+                pin_process(pinned)
+                settings["cpus"] = pinned
+                settings["intra_op"] = min(settings["intra_op"], len(pinned))
+
+        # Read by OpenMP/MKL when torch (or onnxruntime) is first imported
+        os.environ.setdefault("OMP_NUM_THREADS", str(settings["intra_op"]))
+        os.environ.setdefault("MKL_NUM_THREADS", str(settings["intra_op"]))
+        try:
+            import torch
+        except ImportError:
+            pass
+        else:
+            torch.set_num_threads(settings["intra_op"])
+            try:
+                torch.set_num_interop_threads(settings["inter_op"])
+            except RuntimeError:
+                # Only allowed before torch first runs parallel work
+                print("⚠️ torch inter-op threads were already started; keeping torch's setting")
+
+        print(
+            f"🧵 Inference threads: {settings['intra_op']} intra-op, {settings['inter_op']} inter-op "
+            f"for {settings['workers']} worker(s)" + (f", pinned to CPUs {settings['cpus']}" if settings["cpus"] else "")
+        )
+        _settings = settings
+    return _settings
+
+
+def stats():
+    return _settings or thread_settings()
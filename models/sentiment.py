@@ -1,18 +1,260 @@
-from textblob import TextBlob
+import itertools
+import os
+import string
+import threading
 
-def analyze_sentiment(text):
-    """Analyze sentiment using TextBlob with confidence threshold."""
-    if not text.strip():
-        return "Neutral"
+import numpy as np
+
+# Polarity strictly between -NEUTRAL_THRESHOLD and +NEUTRAL_THRESHOLD is labelled neutral
+NEUTRAL_THRESHOLD = 0.05
+
+# lexicon: TextBlob's sentiment lexicon scored with NumPy; textblob: one TextBlob per
+# text; transformer: a batched Hugging Face classifier
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "lexicon")
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "distilbert-base-uncased-finetuned-sst-2-english")
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
 
-    analysis = TextBlob(text)
-    polarity = analysis.sentiment.polarity
+# Punctuation splits words, except "!" (a token of its own) and "-"/"*" inside words like "well-known"
+TOKEN_SEPARATORS = str.maketrans(dict.fromkeys(string.punctuation.translate(str.maketrans("", "", "!*-_")) + "“”‘’—–…«»", " "))
+# Token codes for words that matter to the scoring rules but have no lexicon entry
+UNKNOWN, EXCLAMATION, NEGATION = -1, -2, -3
 
-    # Confidence threshold to determine neutral sentiment
-    if -0.05 < polarity < 0.05:
+_lexicon = None
+_classifier = None
+_load_lock = threading.Lock()
+
+
+def label_for(polarity):
+    """Confidence threshold to determine neutral sentiment."""
+    if -NEUTRAL_THRESHOLD < polarity < NEUTRAL_THRESHOLD:
         return "Neutral"
     elif polarity > 0:
         return "Positive"
     else:
         return "Negative"
 
+
+def analyze_sentiment(text):
+    """Analyze sentiment with the configured backend and confidence threshold."""
+    return analyze_sentiment_batch([text])[0]["label"]
+
+
+def summarize_sentiment(company_name, sentiments):
+    """One-sentence overall sentiment for a company from its lowercase article labels."""
+    positive_count = sentiments.count("positive")
+    negative_count = sentiments.count("negative")
+
+    if positive_count > negative_count:
+        return f"{company_name}’s latest news coverage is mostly positive."
+    elif negative_count > positive_count:
+        return f"{company_name}’s recent news coverage raises concerns about regulatory hurdles."
+    else:
+        return f"{company_name}’s latest news reflects a neutral sentiment."
+
+
+def analyze_sentiment_batch(texts, backend=None):
+    """Score many texts in one pass.
+
+    Returns one `{"label", "polarity", "subjectivity"}` dict per text, in order.
+    The transformer backend has no subjectivity score, so it reports None.
+    """
+    texts = list(texts)
+    backend = backend or SENTIMENT_BACKEND
+    if backend == "lexicon":
+        polarity, subjectivity = _score_lexicon(texts)
+    elif backend == "textblob":
+        polarity, subjectivity = _score_textblob(texts)
+    elif backend == "transformer":
+        polarity, subjectivity = _score_transformer(texts)
+    else:
+        raise ValueError(f"Unknown sentiment backend {backend!r}")
+
+    return [
+        {
+            "label": label_for(p) if text.strip() else "Neutral",
+            "polarity": float(p),
+            "subjectivity": None if s is None else float(s),
+        }
+        for text, p, s in zip(texts, polarity, subjectivity)
+    ]
+
+
+def _score_textblob(texts):
+    # Imported on first use to keep API startup fast
+    from textblob import TextBlob
+
+    scores = [TextBlob(text).sentiment if text.strip() else (0.0, 0.0) for text in texts]
+    return [score[0] for score in scores], [score[1] for score in scores]
+
+
+def _load_lexicon():
+    """Compile TextBlob's sentiment lexicon into a word index and NumPy score arrays."""
+    global _lexicon
+    if _lexicon is None:
+        with _load_lock:
+            if _lexicon is None:
+                from textblob.en import sentiment as pattern_sentiment
+
+                words = [word for word in pattern_sentiment.keys() if " " not in word]
+                # Scores averaged over all parts of speech, as TextBlob uses for plain text
+                scores = np.array([pattern_sentiment[word][None] for word in words], dtype=np.float64)
+                vocab = {word: index for index, word in enumerate(words)}
+                vocab["!"] = EXCLAMATION
+                for word in pattern_sentiment.negations:
+                    vocab.setdefault(word, NEGATION)
+                _lexicon = {
+                    "vocab": vocab,
+                    "polarity": scores[:, 0],
+                    "subjectivity": scores[:, 1],
+                    "intensity": scores[:, 2],
+                    # Adverbs like "very" scale the next known word
+                    "modifier": np.array(
+                        [any(pos in pattern_sentiment[word] for pos in pattern_sentiment.modifiers) for word in words]
+                    ),
+                    "ly": np.array([word.endswith("ly") for word in words]),
+                }
+    return _lexicon
+
+
+def _previous(mask, index):
+    """For each position, the index of the last earlier position where `mask` is set, else -1."""
+    last = np.maximum.accumulate(np.where(mask, index, -1))
+    return np.concatenate(([-1], last[:-1]))
+
+
+def _between(counts, start, end):
+    """Number of flagged positions strictly between `start` and `end`, from a cumulative count."""
+    return counts[end - 1] - counts[np.maximum(start, 0)]
+
+
+def _tokenize(texts):
+    """Lowercased word tokens per text, split the way TextBlob's tokenizer splits them.
+
+    All texts are normalized as one joined string, which is much faster than
+    tokenizing them one at a time.
+    """
+    joined = "\x00".join(text.replace("\x00", " ") for text in texts).lower()
+    # TextBlob turns "isn't" into "is n ' t"
+    joined = joined.replace("n't", " n t").replace("n’t", " n t").translate(TOKEN_SEPARATORS)
+    return [chunk.replace("!", " ! ").split() for chunk in joined.split("\x00")]
+
+
+def _phrase_of(phrase, known_index, positions):
+    """Phrase number of the known words at `positions`."""
+    return phrase[np.searchsorted(known_index, positions)]
+
+
+def _score_lexicon(texts):
+    """TextBlob's pattern scoring rules, applied to all texts at once with array operations.
+
+    Known words are scored from the lexicon; an adverb modifier scales the next
+    known word ("very good"), a preceding negation flips and halves it ("not
+    good"), and "!" boosts the previous one. Polarity and subjectivity are the
+    means over each text's scored words. Emoticons are not scored, and words
+    joined by punctuation ("u.s.") are split, so rare texts score slightly
+    differently from TextBlob.
+    """
+    lexicon = _load_lexicon()
+    vocab = lexicon["vocab"]
+    tokens = _tokenize(texts)
+    counts = np.fromiter((len(words) for words in tokens), dtype=np.int64, count=len(tokens))
+    polarity = np.zeros(len(texts))
+    subjectivity = np.zeros(len(texts))
+    total = int(counts.sum())
+    if total == 0:
+        return polarity, subjectivity
+
+    flat = [word for words in tokens for word in words]
+    ids = np.fromiter(map(vocab.get, flat, itertools.repeat(UNKNOWN)), dtype=np.int64, count=total)
+    lengths = np.fromiter(map(len, flat), dtype=np.int64, count=total)
+    doc = np.repeat(np.arange(len(texts)), counts)
+    doc_start = np.repeat(np.cumsum(counts) - counts, counts)
+    index = np.arange(total)
+
+    known = ids >= 0
+    word = np.where(known, ids, 0)
+    negation = ids == NEGATION
+
+    # A known word follows a modifier when only short (<= 2 character) words sit between them;
+    # it then extends the modifier's scored phrase instead of starting a new one
+    prev_known = _previous(known, index)
+    prev_word = word[np.maximum(prev_known, 0)]
+    has_prev = prev_known >= doc_start
+    long_unknown = np.cumsum(~known & (lengths > 2))
+    after_modifier = has_prev & lexicon["modifier"][prev_word] & (_between(long_unknown, prev_known, index) == 0)
+
+    # "really not good": a negation right after an -ly modifier negates the modifier's phrase
+    # and keeps the modifier active, rather than negating the next word
+    modifier_negation = negation & after_modifier & lexicon["ly"][prev_word]
+    negation &= ~modifier_negation
+    long_unknown = np.cumsum(~known & (lengths > 2) & ~modifier_negation)
+    after_modifier = has_prev & lexicon["modifier"][prev_word] & (_between(long_unknown, prev_known, index) == 0)
+    attached = known & after_modifier
+
+    # A negation carries over single-character words, but not over other words
+    prev_negation = _previous(negation, index)
+    blockers = np.cumsum(known | (~negation & (ids != EXCLAMATION) & (lengths > 1)))
+    negated = known & (prev_negation >= doc_start) & (_between(blockers, prev_negation, index) == 0)
+
+    # Group known words into scored phrases; a phrase's score comes from its last word
+    # scaled by the intensity of the word before it
+    known_index = index[known]
+    phrase = np.cumsum(known & ~attached)[known] - 1
+    phrase_count = int(phrase[-1]) + 1 if len(phrase) else 0
+    if phrase_count == 0:
+        return polarity, subjectivity
+    last = known_index[np.r_[phrase[1:] != phrase[:-1], True]]
+    # A negated modifier weakens instead of intensifies ("not very good")
+    intensity = lexicon["intensity"][prev_word[last]] ** np.where(negated[prev_known[last]], -1.0, 1.0)
+    scale = np.where(attached[last], intensity, 1.0)
+    phrase_polarity = np.clip(lexicon["polarity"][word[last]] * scale, -1.0, 1.0)
+    phrase_subjectivity = np.clip(lexicon["subjectivity"][word[last]] * scale, -1.0, 1.0)
+
+    # Each "!" multiplies the polarity of the phrase before it by 1.25, unless the phrase
+    # continues after it ("very ! good"), in which case its score is recomputed
+    phrase_end = np.zeros(total, dtype=bool)
+    phrase_end[last] = True
+    exclamations = index[(ids == EXCLAMATION) & has_prev]
+    exclamations = exclamations[phrase_end[prev_known[exclamations]]]
+    boosts = np.bincount(_phrase_of(phrase, known_index, prev_known[exclamations]), minlength=phrase_count)
+    phrase_polarity = np.clip(phrase_polarity * 1.25 ** boosts, -1.0, 1.0)
+
+    # "not good" = slightly bad, "not bad" = slightly good
+    phrase_negated = np.bincount(phrase, weights=negated[known], minlength=phrase_count) > 0
+    phrase_negated[_phrase_of(phrase, known_index, prev_known[modifier_negation])] = True
+    phrase_polarity = np.where(phrase_negated, phrase_polarity * -0.5, phrase_polarity)
+
+    phrase_doc = doc[last]
+    scored = np.bincount(phrase_doc, minlength=len(texts))
+    polarity = np.bincount(phrase_doc, weights=phrase_polarity, minlength=len(texts)) / np.maximum(scored, 1)
+    subjectivity = np.bincount(phrase_doc, weights=phrase_subjectivity, minlength=len(texts)) / np.maximum(scored, 1)
+    return polarity, subjectivity
+
+
+def _score_transformer(texts):
+    global _classifier
+    if _classifier is None:
+        with _load_lock:
+            if _classifier is None:
+                from transformers import pipeline
+
+                from models.inference_threads import configure_inference_threads
+
+                configure_inference_threads()
+                _classifier = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+
+    polarity = [0.0] * len(texts)
+    non_empty = [i for i, text in enumerate(texts) if text.strip()]
+    if non_empty:
+        results = _classifier(
+            [texts[i] for i in non_empty], batch_size=SENTIMENT_BATCH_SIZE, truncation=True
+        )
+        for i, result in zip(non_empty, results):
+            # Signed confidence of the predicted class
+            polarity[i] = result["score"] if result["label"].upper().startswith("POS") else -result["score"]
+    return polarity, [None] * len(texts)
+
+
+def warm_up():
+    """Load the sentiment backend ahead of the first request."""
+    analyze_sentiment("warm up")
@@ -1,23 +1,309 @@
-from transformers import pipeline
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+from models.batching import BatchScheduler
+from models.inference_client import RemoteSummarizer
+from models.summarizer_backends import SUMMARIZER_BACKEND, load_summarizer
+from utils.cache import DiskCache, LRUCache, TieredCache
+
+# Pinned to the pipeline's default checkpoint so cache keys stay stable across processes
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-12-6")
+# Hub revision (branch, tag or commit) of the checkpoint; unset uses the latest
+SUMMARIZER_REVISION = os.getenv("SUMMARIZER_REVISION") or None
+
+# When a shared inference server is configured, this process never loads the model
+SUMMARIZER_SOCKET = os.getenv("SUMMARIZER_SOCKET")
+
+remote_summarizer = RemoteSummarizer(SUMMARIZER_SOCKET) if SUMMARIZER_SOCKET else None
+
+# Loaded on first use by get_summarizer() so importing this module stays cheap
+summarizer = None
+_summarizer_lock = threading.Lock()
+
+# Texts longer than this many tokens (capped by the model's input limit) are summarized in chunks
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "900"))
+# Sentences repeated at the start of the next chunk so context isn't lost at a boundary
+SUMMARY_CHUNK_OVERLAP = int(os.getenv("SUMMARY_CHUNK_OVERLAP", "1"))
+# Most generate inputs spent on one text: its chunks plus the summary of their summaries
+SUMMARY_MAX_CALLS = int(os.getenv("SUMMARY_MAX_CALLS", "9"))
+# Shortest summary asked of a chunk, however many chunks share the reduce step's input
+MIN_CHUNK_SUMMARY_TOKENS = 32
+
+# Inputs of at most this many tokens are returned as they are instead of being summarized
+SUMMARY_PASSTHROUGH_TOKENS = int(os.getenv("SUMMARY_PASSTHROUGH_TOKENS", "40"))
+# Scale max_length/min_length to these fractions of the input's tokens (never above the request's)
+SUMMARY_ADAPTIVE_LENGTH = os.getenv("SUMMARY_ADAPTIVE_LENGTH", "1") == "1"
+SUMMARY_MAX_LENGTH_RATIO = float(os.getenv("SUMMARY_MAX_LENGTH_RATIO", "0.75"))
+SUMMARY_MIN_LENGTH_RATIO = float(os.getenv("SUMMARY_MIN_LENGTH_RATIO", "0.25"))
+# Scaled lengths are rounded to this step so inputs of similar length still share a batch
+LENGTH_STEP = 16
+# Beam search width; 1 is greedy decoding, unset uses the checkpoint's default (4 for distilbart-cnn)
+SUMMARY_NUM_BEAMS = int(os.getenv("SUMMARY_NUM_BEAMS") or "0")
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+EMPTY_SUMMARY = "No content to summarize."
+ERROR_SUMMARY = "Error occurred during summarization."
+
+summary_cache = None
+
+
+def configure_summary_cache(cache_dir=None, max_items=None, max_mb=None):
+    """(Re)build the summary cache; an empty `cache_dir` keeps it memory-only."""
+    global summary_cache
+    if cache_dir is None:
+        cache_dir = os.getenv("SUMMARY_CACHE_DIR", os.path.join(tempfile.gettempdir(), "cache", "summaries"))
+    max_items = max_items or int(os.getenv("SUMMARY_CACHE_MEMORY_ITEMS", "1024"))
+    max_mb = max_mb or int(os.getenv("SUMMARY_CACHE_MAX_MB", "256"))
+
+    disk = DiskCache(os.path.join(cache_dir, "summaries.sqlite3"), max_mb * 1024 * 1024) if cache_dir else None
+    summary_cache = TieredCache(LRUCache(max_items), disk)
+    return summary_cache
+
+
+def summary_model_id():
+    """Model, revision and backend, as they affect summary text; fp32 keeps the bare model id."""
+    model_id = SUMMARIZER_MODEL
+    if SUMMARIZER_REVISION:
+        model_id += f"@{SUMMARIZER_REVISION}"
+    if SUMMARIZER_BACKEND != "torch":
+        model_id += f"+{SUMMARIZER_BACKEND}"
+    return model_id
+
+
+def generation_settings_id():
+    """Generation settings beyond the requested lengths that change summary text."""
+    adaptive = f"{SUMMARY_MAX_LENGTH_RATIO}:{SUMMARY_MIN_LENGTH_RATIO}" if SUMMARY_ADAPTIVE_LENGTH else "fixed"
+    return f"{adaptive}|{SUMMARY_PASSTHROUGH_TOKENS}|{SUMMARY_NUM_BEAMS or 'default'}"
+
+
+def summary_cache_key(text, max_length, min_length):
+    """Content address for a summary: normalized text, model id and generation params."""
+    normalized = " ".join(text.split())
+    params = f"{summary_model_id()}|{generation_settings_id()}|{max_length}|{min_length}"
+    return hashlib.sha256(f"{params}|{normalized}".encode("utf-8")).hexdigest()
+
+
+configure_summary_cache()
+
+
+def get_summarizer():
+    """Return the summarization pipeline, loading it once in a thread-safe way."""
+    global summarizer
+    if summarizer is None:
+        with _summarizer_lock:
+            if summarizer is None:
+                summarizer = load_summarizer(SUMMARIZER_MODEL, SUMMARIZER_REVISION)
+    return summarizer
+
+
+def warm_up():
+    """Load the model (or wait for the inference server) ahead of the first request."""
+    if remote_summarizer is not None:
+        remote_summarizer.generate(["Warm up the summarization model."])
+    else:
+        get_summarizer()
 
-# Load summarizer pipeline
-summarizer = pipeline("summarization")
 
 def summarize(text, max_length=150, min_length=50):
     """Summarize the given text using Hugging Face summarization pipeline."""
-    if not text.strip():
-        return "No content to summarize."
+    return summarize_batch([text], max_length=max_length, min_length=min_length)[0]
+
+
+def summarize_batch(texts, max_length=150, min_length=50, batch_size=8):
+    """Summarize many texts with length-bucketed batches, keeping input order."""
+    summaries = [EMPTY_SUMMARY] * len(texts)
+    keys = {}
+    pending = []
+
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        keys[i] = summary_cache_key(text, max_length, min_length)
+        cached = summary_cache.get(keys[i])
+        if cached is not None:
+            summaries[i] = cached
+        else:
+            pending.append(i)
+
+    generated = generate_summaries([texts[i] for i in pending], max_length, min_length, batch_size)
+    for i, summary in zip(pending, generated):
+        summaries[i] = summary
+        if summary != ERROR_SUMMARY:
+            summary_cache.set(keys[i], summary)
 
+    return summaries
+
+
+def chunk_budget(tokenizer):
+    """Tokens per chunk, leaving room for the special tokens the model adds."""
+    return min(SUMMARY_CHUNK_TOKENS, tokenizer.model_max_length - tokenizer.num_special_tokens_to_add())
+
+
+def split_into_chunks(text, tokenizer, budget, overlap=SUMMARY_CHUNK_OVERLAP, max_chunks=None):
+    """Split text on sentence boundaries into chunks of at most `budget` tokens.
+
+    Returns `[text]` when it already fits. A sentence longer than the budget is
+    cut into token windows. Each chunk after the first starts with the last
+    `overlap` sentences of the one before, if they take at most half the budget.
+    Past `max_chunks`, the rest of the text is dropped: news leads with what matters.
+    """
+    # Every byte-level BPE token covers at least one byte, so short texts skip the tokenizer
+    if len(text.encode("utf-8")) <= budget:
+        return [text]
+
+    sentences = [sentence for sentence in SENTENCE_END.split(text.strip()) if sentence]
+    token_ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+    if sum(len(ids) for ids in token_ids) <= budget:
+        return [text]
+
+    pieces = []
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) <= budget:
+            pieces.append((sentence, len(ids)))
+        else:
+            for start in range(0, len(ids), budget):
+                window = ids[start:start + budget]
+                pieces.append((tokenizer.decode(window, skip_special_tokens=True), len(window)))
+
+    chunks = []
+    current, size = [], 0
+    for piece, length in pieces:
+        if current and size + length > budget:
+            chunks.append(" ".join(sentence for sentence, _ in current))
+            if max_chunks and len(chunks) == max_chunks:
+                print(f"⚠️ Summarizing the first {max_chunks} chunks of a long text; the rest is dropped")
+                return chunks
+            current = current[-overlap:] if overlap else []
+            size = sum(n for _, n in current)
+            if size > budget // 2 or size + length > budget:
+                current, size = [], 0
+        current.append((piece, length))
+        size += length
+    chunks.append(" ".join(sentence for sentence, _ in current))
+    return chunks
+
+
+def generation_lengths(input_tokens, max_length, min_length):
+    """max_length/min_length for an input of `input_tokens`, so short inputs get short summaries."""
+    if not SUMMARY_ADAPTIVE_LENGTH:
+        return max_length, min_length
+    # Round up to a step, so similar inputs get the same bounds and can share a generate call
+    scaled_max = -(-int(input_tokens * SUMMARY_MAX_LENGTH_RATIO) // LENGTH_STEP) * LENGTH_STEP
+    job_max = min(max_length, max(LENGTH_STEP, scaled_max))
+    scaled_min = int(input_tokens * SUMMARY_MIN_LENGTH_RATIO) // LENGTH_STEP * LENGTH_STEP
+    return job_max, min(min_length, scaled_min, job_max // 2)
+
+
+def generate_summaries(texts, max_length=150, min_length=50, batch_size=8):
+    """Run the model on non-empty texts, bypassing the cache, keeping input order.
+
+    Texts of at most SUMMARY_PASSTHROUGH_TOKENS tokens are returned unchanged.
+    Others get generation lengths scaled to their token count. Texts over the
+    chunk budget are map-reduced: all chunks are summarized in shared batches,
+    then each text's chunk summaries are summarized together.
+    """
+    if not texts:
+        return []
+    if remote_summarizer is not None:
+        try:
+            return remote_summarizer.generate(texts, max_length=max_length, min_length=min_length)
+        except Exception as e:
+            print(f"Error in summarization: {e}")
+            return [ERROR_SUMMARY] * len(texts)
+
+    summaries = [ERROR_SUMMARY] * len(texts)
+    tokenizer = get_summarizer().tokenizer
+    budget = chunk_budget(tokenizer)
+
+    # Map: texts that fit, plus every chunk of those that don't, grouped by generation length
+    jobs = {}
+    fits = []
+    for i, text in enumerate(texts):
+        chunks = split_into_chunks(text, tokenizer, budget, max_chunks=max(1, SUMMARY_MAX_CALLS - 1))
+        if len(chunks) == 1:
+            fits.append((i, chunks[0]))
+            continue
+        # Shorter chunk summaries so that together they fit in one reduce input
+        chunk_max = min(max_length, max(MIN_CHUNK_SUMMARY_TOKENS, budget // len(chunks)))
+        chunk_min = min(min_length, chunk_max // 2)
+        jobs.setdefault((chunk_max, chunk_min), []).extend((i, True, chunk) for chunk in chunks)
+
+    token_ids = tokenizer([text for _, text in fits], add_special_tokens=False)["input_ids"] if fits else []
+    for (i, text), ids in zip(fits, token_ids):
+        if len(ids) <= SUMMARY_PASSTHROUGH_TOKENS:
+            # Already shorter than any useful summary; generating would only pad it out
+            summaries[i] = " ".join(text.split())
+            continue
+        jobs.setdefault(generation_lengths(len(ids), max_length, min_length), []).append((i, False, text))
+
+    partials = {}
+    for (job_max, job_min), group in jobs.items():
+        generated = _generate_bucketed([text for _, _, text in group], job_max, job_min, batch_size)
+        for (i, is_chunk, _), summary in zip(group, generated):
+            if not is_chunk:
+                summaries[i] = summary
+            elif summary != ERROR_SUMMARY:
+                partials.setdefault(i, []).append(summary)
+
+    # Reduce: one summary per long text from its chunk summaries, in order
+    reduce_ids = list(partials)
+    reduced = _generate_bucketed([" ".join(partials[i]) for i in reduce_ids], max_length, min_length, batch_size)
+    for i, summary in zip(reduce_ids, reduced):
+        summaries[i] = summary
+
+    return summaries
+
+
+def _generate_bucketed(texts, max_length, min_length, batch_size):
+    """Generate in length-sorted buckets of `batch_size`, keeping input order."""
+    summaries = [ERROR_SUMMARY] * len(texts)
+
+    # Sort by length so each bucket pads to a similar length
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        for i, summary in zip(bucket, _generate([texts[i] for i in bucket], max_length, min_length)):
+            summaries[i] = summary
+
+    return summaries
+
+
+def _generate(texts, max_length, min_length):
+    """Run one generate call for a bucket, falling back to per-text calls on failure."""
+    params = {"num_beams": SUMMARY_NUM_BEAMS} if SUMMARY_NUM_BEAMS else {}
     try:
-        # Summarize the content
-        summary_result = summarizer(
-            text,
+        results = get_summarizer()(
+            texts,
             max_length=max_length,
             min_length=min_length,
-            do_sample=False
+            do_sample=False,
+            truncation=True,
+            batch_size=len(texts),
+            **params,
         )
-        return summary_result[0]["summary_text"]
+        return [result["summary_text"] for result in results]
     except Exception as e:
+        if len(texts) > 1:
+            # Isolate the failing input instead of failing the whole bucket
+            return [summary for text in texts for summary in _generate([text], max_length, min_length)]
         print(f"Error in summarization: {e}")
-        return "Error occurred during summarization."
+        return [ERROR_SUMMARY]
+
+
+# Cross-request micro-batching: jobs from all in-flight requests share generate calls
+summary_scheduler = BatchScheduler(
+    lambda texts, **params: summarize_batch(texts, batch_size=len(texts), **params),
+    max_batch_size=int(os.getenv("SUMMARY_BATCH_SIZE", "16")),
+    max_wait_ms=float(os.getenv("SUMMARY_BATCH_WAIT_MS", "10")),
+    name="summary-scheduler",
+)
+
 
+def submit_summaries(texts, max_length=150, min_length=50):
+    """Queue texts on the shared scheduler and return one Future per text."""
+    return summary_scheduler.submit_many(texts, max_length=max_length, min_length=min_length)
@@ -0,0 +1,82 @@
+import os
+import tempfile
+
+from models.inference_threads import configure_inference_threads
+
+# torch: fp32 PyTorch; torch-int8: PyTorch with dynamic int8 quantization of Linear layers;
+# onnx: the model exported to ONNX Runtime (needs `pip install optimum[onnxruntime]`)
+SUMMARIZER_BACKEND = os.getenv("SUMMARIZER_BACKEND", "torch")
+
+# Exported ONNX models are saved here and reused on the next start
+ONNX_CACHE_DIR = os.getenv("SUMMARIZER_ONNX_DIR", os.path.join(tempfile.gettempdir(), "cache", "onnx"))
+
+
+def load_tokenizer(model, revision=None):
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(model, revision=revision)
+
+
+def load_torch(model, revision, tokenizer):
+    from transformers import AutoModelForSeq2SeqLM, pipeline
+
+    return pipeline(
+        "summarization",
+        model=AutoModelForSeq2SeqLM.from_pretrained(model, revision=revision),
+        tokenizer=tokenizer,
+    )
+
+
+def load_torch_int8(model, revision, tokenizer):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, pipeline
+
+    # Weights of Linear layers are stored as int8; activations are quantized on the fly
+    quantized = torch.quantization.quantize_dynamic(
+        AutoModelForSeq2SeqLM.from_pretrained(model, revision=revision), {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return pipeline("summarization", model=quantized, tokenizer=tokenizer)
+
+
+def load_onnx(model, revision, tokenizer):
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise RuntimeError("SUMMARIZER_BACKEND=onnx needs `pip install optimum[onnxruntime]`") from e
+    from transformers import pipeline
+
+    threads = configure_inference_threads()
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = threads["intra_op"]
+    session_options.inter_op_num_threads = threads["inter_op"]
+
+    export_dir = os.path.join(ONNX_CACHE_DIR, f"{model}@{revision or 'main'}".replace("/", "--"))
+    if os.path.isdir(export_dir):
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=session_options)
+    else:
+        print(f"📦 Exporting {model} to ONNX in {export_dir} (first start only)")
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(
+            model, revision=revision, export=True, session_options=session_options
+        )
+        ort_model.save_pretrained(export_dir)
+    return pipeline("summarization", model=ort_model, tokenizer=tokenizer)
+
+
+SUMMARIZER_BACKENDS = {
+    "torch": load_torch,
+    "torch-int8": load_torch_int8,
+    "onnx": load_onnx,
+}
+
+
+def load_summarizer(model, revision=None, backend=None, tokenizer=None):
+    """Build a summarization pipeline for `backend`, reusing `tokenizer` when given."""
+    backend = backend or SUMMARIZER_BACKEND
+    if backend not in SUMMARIZER_BACKENDS:
+        raise ValueError(f"Unknown summarizer backend {backend!r}; choose from {', '.join(SUMMARIZER_BACKENDS)}")
+    # Thread counts must be set before the backend starts its thread pools
+    configure_inference_threads()
+    if tokenizer is None:
+        tokenizer = load_tokenizer(model, revision)
+    return SUMMARIZER_BACKENDS[backend](model, revision, tokenizer)
@@ -0,0 +1,87 @@
+import os
+import re
+import threading
+import time
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz, ~26 ms): header plus zeroed payload
+SILENT_MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)
+SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+# Seconds gTTS waits on each request to Google's TTS endpoint
+TTS_REQUEST_TIMEOUT = float(os.getenv("TTS_REQUEST_TIMEOUT", "15"))
+
+
+class TTSBackend:
+    """Interface for speech synthesis engines used by `models/hindi_tts.py`.
+
+    Implementations are synchronous and may block; callers run them on an
+    executor. `stream()` yields MP3 bytes as they are produced.
+    """
+
+    name = "base"
+
+    def stream(self, text, lang):
+        raise NotImplementedError
+
+    def write_to_fp(self, text, lang, fp):
+        for chunk in self.stream(text, lang):
+            fp.write(chunk)
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate's TTS endpoint via gTTS (requires network access)."""
+
+    name = "gtts"
+
+    def stream(self, text, lang):
+        from gtts import gTTS
+
+        # gTTS synthesizes one request per text segment and yields audio as each arrives
+        yield from gTTS(text=text, lang=lang, timeout=TTS_REQUEST_TIMEOUT).stream()
+
+
+class SilentBackend(TTSBackend):
+    """Offline engine that emits valid silent MP3 sized to the text, for tests and benchmarks.
+
+    Like gTTS it produces audio one sentence at a time; `latency` simulates the
+    synthesis time per sentence (default `TTS_SILENT_LATENCY`, 0 seconds).
+    """
+
+    name = "silent"
+
+    def __init__(self, latency=None):
+        self.latency = float(os.getenv("TTS_SILENT_LATENCY", "0")) if latency is None else latency
+
+    def stream(self, text, lang):
+        for sentence in SENTENCE_END.split(text):
+            if not sentence.strip():
+                continue
+            if self.latency:
+                time.sleep(self.latency)
+            # Roughly 80 ms of audio per character
+            yield SILENT_MP3_FRAME * max(1, len(sentence) * 3)
+
+
+TTS_BACKENDS = {backend.name: backend for backend in (GTTSBackend, SilentBackend)}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_tts_backend():
+    """Return the configured backend (`TTS_BACKEND`, default gtts), creating it once."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = os.getenv("TTS_BACKEND", GTTSBackend.name)
+                if name not in TTS_BACKENDS:
+                    raise ValueError(f"Unknown TTS_BACKEND {name!r}; choose from {sorted(TTS_BACKENDS)}")
+                _backend = TTS_BACKENDS[name]()
+    return _backend
+
+
+def set_tts_backend(backend):
+    """Replace the active backend, e.g. with an offline engine in tests."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
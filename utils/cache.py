@@ -0,0 +1,266 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache."""
+
+    def __init__(self, max_items=1024):
+        self.max_items = max_items
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SharedSQLite:
+    """A SQLite file shared by every process that opens it, with one connection per thread.
+
+    WAL mode lets readers run alongside the single writer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+    def connect(self):
+        # sqlite3 connections can't be shared between threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+class DiskCache:
+    """SQLite-backed cache shared by every process that opens the same file.
+
+    Values are stored as JSON. When the stored payload exceeds `max_bytes`, the
+    least recently used entries are evicted. The payload total is kept up to date
+    by triggers, and access times are written in batches, so reads never take
+    SQLite's write lock on their own.
+    """
+
+    # Access times are buffered in memory and written once this many are pending...
+    ACCESS_FLUSH_ITEMS = 256
+    # ...or this many seconds after the oldest was recorded, whichever comes first
+    ACCESS_FLUSH_SECONDS = 30.0
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = SharedSQLite(path)
+        self._accessed = {}
+        self._accessed_since = None
+        self._accessed_lock = threading.Lock()
+
+        with self._db.connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries"
+                " BEGIN UPDATE totals SET size = size + new.size WHERE id = 0; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries"
+                " BEGIN UPDATE totals SET size = size + new.size - old.size WHERE id = 0; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries"
+                " BEGIN UPDATE totals SET size = size - old.size WHERE id = 0; END"
+            )
+            # Files written before the totals table existed start from their current payload
+            conn.execute("INSERT OR IGNORE INTO totals (id, size) SELECT 0, COALESCE(SUM(size), 0) FROM entries")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, token TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def get(self, key, max_age=None):
+        """Return the cached value, or None if missing or older than `max_age` seconds."""
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        value, created = entry
+        if max_age is not None and time.time() - created > max_age:
+            return None
+        return value
+
+    def get_entry(self, key):
+        """Return `(value, created_timestamp)` for a key, or None."""
+        try:
+            row = self._db.connect().execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+
+        now = time.time()
+        with self._accessed_lock:
+            self._accessed[key] = now
+            if self._accessed_since is None:
+                self._accessed_since = now
+            due = (
+                len(self._accessed) >= self.ACCESS_FLUSH_ITEMS
+                or now - self._accessed_since >= self.ACCESS_FLUSH_SECONDS
+            )
+        if due:
+            try:
+                with self._db.connect() as conn:
+                    self._flush_accessed(conn)
+            except sqlite3.Error as e:
+                print(f"⚠️ Cache access-time update failed: {e}")
+        return json.loads(row[0]), row[1]
+
+    def _flush_accessed(self, conn):
+        """Write the buffered access times inside the caller's transaction."""
+        with self._accessed_lock:
+            accessed, self._accessed, self._accessed_since = self._accessed, {}, None
+        if accessed:
+            conn.executemany(
+                "UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?",
+                [(when, key) for key, when in accessed.items()],
+            )
+
+    def set(self, key, value):
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        try:
+            with self._db.connect() as conn:
+                conn.execute(
+                    "INSERT INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size,"
+                    " created = excluded.created, accessed = excluded.accessed",
+                    (key, payload, len(payload.encode("utf-8")), now, now),
+                )
+                # Eviction below must see recent reads as recent
+                self._flush_accessed(conn)
+                self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache write failed: {e}")
+
+    def try_lease(self, key, seconds):
+        """Claim `key` for up to `seconds` across every process sharing this file.
+
+        Returns a token for `release_lease()`, or None while another holder's
+        lease is live. A holder that dies loses its lease when it expires.
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        try:
+            with self._db.connect() as conn:
+                claimed = conn.execute(
+                    "INSERT INTO leases (key, token, expires) VALUES (?, ?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET token = excluded.token, expires = excluded.expires"
+                    " WHERE leases.expires < ?",
+                    (key, token, now + seconds, now),
+                ).rowcount
+        except sqlite3.Error as e:
+            # Without the lease we just fetch like a single process would
+            print(f"⚠️ Cache lease failed: {e}")
+            return token
+        return token if claimed else None
+
+    def release_lease(self, key, token):
+        try:
+            with self._db.connect() as conn:
+                conn.execute("DELETE FROM leases WHERE key = ? AND token = ?", (key, token))
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache lease release failed: {e}")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT size FROM totals WHERE id = 0").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        expired = []
+        # Read only as many of the least recently used rows as it takes to get under budget
+        cursor = conn.execute("SELECT key, size FROM entries ORDER BY accessed")
+        for key, size in cursor:
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        cursor.close()
+        conn.executemany("DELETE FROM entries WHERE key = ?", expired)
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional shared disk cache, with hit/miss counters."""
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+                self._count("disk_hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_items": len(self.memory),
+            "disk_path": self.disk.path if self.disk is not None else None,
+        }
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+
+from utils.cache import SharedSQLite
+
+# Statuses after which a job never changes again
+FINISHED_STATUSES = {"done", "failed", "rejected"}
+
+
+class JobQueueFull(Exception):
+    """Raised by `JobWorkerPool.submit()` when the queue has no room; carries the job id."""
+
+    def __init__(self, job_id):
+        super().__init__(f"Job queue is full; job {job_id} was rejected")
+        self.job_id = job_id
+
+
+class JobStore:
+    """SQLite-backed job records shared by every process that opens the same file.
+
+    Any uvicorn worker can answer a status request for a job another worker runs.
+    Records are deleted `max_age` seconds after their last update.
+    """
+
+    def __init__(self, path, max_age=3600):
+        self.path = path
+        self.max_age = max_age
+        self._db = SharedSQLite(path)
+
+        with self._db.connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL,"
+                " result TEXT, error TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated)")
+
+    def create(self, kind):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db.connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, created, updated) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, kind, now, now),
+            )
+        return job_id
+
+    def update(self, job_id, status, result=None, error=None):
+        with self._db.connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+
+    def get(self, job_id):
+        """Return the job as a dict, or None if it is unknown or expired."""
+        row = self._db.connect().execute(
+            "SELECT id, kind, status, result, error, created, updated FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "result": json.loads(row[3]) if row[3] is not None else None,
+            "error": row[4],
+            "created": row[5],
+            "updated": row[6],
+        }
+
+    def purge(self):
+        """Delete records not updated within `max_age` seconds."""
+        with self._db.connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE updated < ?", (time.time() - self.max_age,))
+
+
+class JobWorkerPool:
+    """Run async jobs on a fixed number of worker tasks fed by a bounded queue.
+
+    Job records are read and written off the event loop. `submit()` fails fast with JobQueueFull when the queue is full, so callers
+    shed load instead of piling up work the workers can't catch up on. A job
+    running longer than `timeout` seconds is cancelled and marked failed, so a
+    hung handler frees its worker.
+    """
+
+    def __init__(self, store, kind, handler, workers=2, max_queue=32, timeout=None):
+        self.store = store
+        self.kind = kind
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout or None
+        self._queue = None
+        self._tasks = []
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "timed_out": 0}
+
+    def start(self):
+        """Start the workers on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"{self.kind}-worker-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, *args):
+        """Queue `handler(*args)` and return its job id."""
+        job_id = await asyncio.to_thread(self.store.create, self.kind)
+        try:
+            self._queue.put_nowait((job_id, args))
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            await asyncio.to_thread(self.store.update, job_id, "rejected", error="Job queue is full")
+            raise JobQueueFull(job_id)
+        self._stats["submitted"] += 1
+        return job_id
+
+    async def _record(self, job_id, status, **fields):
+        # A failed status write must not kill the worker
+        try:
+            await asyncio.to_thread(self.store.update, job_id, status, **fields)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not record {status} for job {job_id}: {e}")
+
+    async def _work(self):
+        while True:
+            job_id, args = await self._queue.get()
+            try:
+                await self._record(job_id, "running")
+                result = await asyncio.wait_for(self.handler(*args), self.timeout)
+                await self._record(job_id, "done", result=result)
+                self._stats["completed"] += 1
+            except asyncio.TimeoutError:
+                print(f"❌ {self.kind} job {job_id} timed out after {self.timeout:g}s")
+                await self._record(job_id, "failed", error=f"Timed out after {self.timeout:g}s")
+                self._stats["failed"] += 1
+                self._stats["timed_out"] += 1
+            except Exception as e:
+                print(f"❌ {self.kind} job {job_id} failed: {e}")
+                await self._record(job_id, "failed", error=str(e))
+                self._stats["failed"] += 1
+            finally:
+                self._queue.task_done()
+
+            try:
+                await asyncio.to_thread(self.store.purge)
+            except sqlite3.Error as e:
+                print(f"⚠️ Job purge failed: {e}")
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "workers": self.workers,
+            "timeout": self.timeout,
+            **self._stats,
+        }
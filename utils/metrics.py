@@ -0,0 +1,300 @@
+import bisect
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# Pipeline stages timed per request and exported to Prometheus
+STAGES = ("scrape", "summarize", "sentiment", "compare", "translate", "tts")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Every API worker writes its snapshot here; /metrics merges the live ones, so a scrape
+# that lands on any worker reports the whole server. Empty keeps metrics per process.
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "metrics"))
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# A snapshot not rewritten for this long belongs to a worker that has exited
+METRICS_STALE_SECONDS = 3 * METRICS_FLUSH_SECONDS
+# Workers of one server share their parent (uvicorn's supervisor); snapshots from
+# another server sharing METRICS_DIR carry a different run id and are left out
+RUN_ID = str(os.getppid())
+# Tells this process's snapshots apart from an earlier worker that had the same pid
+INSTANCE_ID = uuid.uuid4().hex
+# Tombstones of another run are deleted once this old; that run's server is long gone
+TOMBSTONE_MAX_AGE = 24 * 3600
+
+# Stage spans of the request being handled, for its Server-Timing header
+request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def label_key(labels):
+    """Labels in Prometheus' `name="value"` form, sorted so equal label sets share a series."""
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """Counters and histograms rendered in Prometheus' text exposition format.
+
+    Thread-safe. Series are created on first use; metric names and help text
+    are declared up front with `counter()` and `histogram()`.
+    """
+
+    def __init__(self, directory=METRICS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._help = {}
+        self._buckets = {}
+        self._counters = {}
+        self._histograms = {}
+
+    def counter(self, name, help_text):
+        self._help[name] = ("counter", help_text)
+        self._counters.setdefault(name, {})
+        return name
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self._help[name] = ("histogram", help_text)
+        self._buckets[name] = tuple(buckets)
+        self._histograms.setdefault(name, {})
+        return name
+
+    def inc(self, name, amount=1, **labels):
+        key = label_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = label_key(labels)
+        buckets = self._buckets[name]
+        with self._lock:
+            series = self._histograms[name]
+            # Per-bucket counts (not cumulative), then the +Inf bucket, sum and count
+            state = series.setdefault(key, [0] * (len(buckets) + 1) + [0.0, 0])
+            state[bisect.bisect_left(buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": {name: dict(series) for name, series in self._counters.items()},
+                "histograms": {name: {key: list(state) for key, state in series.items()} for name, series in self._histograms.items()},
+            }
+
+    def write_snapshot(self):
+        """Publish this process's metrics for the other workers' /metrics."""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump({"run": RUN_ID, "instance": INSTANCE_ID, **self.snapshot()}, file)
+        os.replace(temp_path, path)
+
+    def collect(self):
+        """This process's metrics merged with the snapshots of the server's other workers.
+
+        Liveness is judged from a snapshot's age rather than its pid, which may
+        have been reused by an unrelated process. An exited worker's last
+        snapshot is renamed to a tombstone and still merged, so the server's
+        counters never go down, which Prometheus would read as a reset. Counters
+        and histograms are all this registry has; a gauge would have to be
+        dropped from the tombstone instead.
+        """
+        merged = self.snapshot()
+        if not self.directory or not os.path.isdir(self.directory):
+            return merged
+
+        snapshots = {}
+        for name in sorted(os.listdir(self.directory)):
+            stem, ext = os.path.splitext(name)
+            if ext != ".json":
+                continue
+            tombstone = stem.startswith("dead-")
+            if not tombstone and (not stem.isdigit() or int(stem) == os.getpid()):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                age = time.time() - os.path.getmtime(path)
+                with open(path) as file:
+                    other = json.load(file)
+            except (OSError, ValueError):
+                continue
+
+            if other.get("run") != RUN_ID:
+                # Another server's (or an earlier run's) files; theirs to merge, ours to clean up once dead
+                if age > (TOMBSTONE_MAX_AGE if tombstone else METRICS_STALE_SECONDS):
+                    self._remove(path)
+                continue
+            if not tombstone and age > METRICS_STALE_SECONDS:
+                # That worker has exited. Renaming claims it, so only one worker writes its tombstone
+                try:
+                    os.replace(path, os.path.join(self.directory, f"dead-{other.get('instance', stem)}.json"))
+                except OSError:
+                    continue
+            instance = other.get("instance", stem)
+            if instance == INSTANCE_ID:
+                continue
+            # A worker's live snapshot is newer than a tombstone written while it stalled
+            if instance not in snapshots or not tombstone:
+                snapshots[instance] = other
+
+        for other in snapshots.values():
+            for metric, series in other.get("counters", {}).items():
+                target = merged["counters"].setdefault(metric, {})
+                for key, value in series.items():
+                    target[key] = target.get(key, 0) + value
+            for metric, series in other.get("histograms", {}).items():
+                target = merged["histograms"].setdefault(metric, {})
+                for key, state in series.items():
+                    current = target.get(key)
+                    target[key] = state if current is None else [a + b for a, b in zip(current, state)]
+        return merged
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def render(self):
+        """All metrics in Prometheus' text format (version 0.0.4)."""
+        collected = self.collect()
+        lines = []
+        for name, (kind, help_text) in self._help.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for key, value in sorted(collected["counters"].get(name, {}).items()):
+                    lines.append(f"{name}{{{key}}} {value}" if key else f"{name} {value}")
+                continue
+
+            buckets = self._buckets[name]
+            for key, state in sorted(collected["histograms"].get(name, {}).items()):
+                prefix = f"{key}," if key else ""
+                cumulative = 0
+                for bound, count in zip(buckets + ("+Inf",), state):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                labels = f"{{{key}}}" if key else ""
+                lines.append(f"{name}_sum{labels} {state[-2]}")
+                lines.append(f"{name}_count{labels} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def start_flusher(self, interval=METRICS_FLUSH_SECONDS):
+        """Write this worker's snapshot every `interval` seconds in a daemon thread."""
+        if not self.directory:
+            return None
+
+        def flush():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_snapshot()
+                except OSError as e:
+                    print(f"⚠️ Could not write metrics snapshot: {e}")
+
+        thread = threading.Thread(target=flush, name="metrics-flusher", daemon=True)
+        thread.start()
+        return thread
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "newsanalysis_stage_duration_seconds",
+    "Time spent in a pipeline stage (per NewsAPI page, per article, or per request for compare/translate/tts)",
+)
+STAGE_ERRORS = metrics.counter("newsanalysis_stage_errors_total", "Pipeline stage failures")
+STAGE_FALLBACKS = metrics.counter(
+    "newsanalysis_stage_fallbacks_total", "Degraded results served instead of failing, by stage and reason"
+)
+REQUEST_SECONDS = metrics.histogram("newsanalysis_request_duration_seconds", "HTTP request duration by handler")
+# Export zeros from the start so rate() and alerts work before the first failure
+for _stage in STAGES:
+    metrics.inc(STAGE_ERRORS, 0, stage=_stage)
+
+
+def count_error(stage):
+    metrics.inc(STAGE_ERRORS, stage=stage)
+
+
+def count_fallback(stage, reason):
+    metrics.inc(STAGE_FALLBACKS, stage=stage, reason=reason)
+
+
+@contextmanager
+def stage_timer(stage):
+    """Time a block as `stage`: record it in the histogram and the request's Server-Timing.
+
+    An exception escaping the block counts as a stage error.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        count_error(stage)
+        raise
+    finally:
+        end = time.perf_counter()
+        metrics.observe(STAGE_SECONDS, end - start, stage=stage)
+        timings = request_timings.get()
+        if timings is not None:
+            # Concurrent runs of a stage (one per article) show as the span they covered
+            first, last = timings.get(stage, (start, end))
+            timings[stage] = (min(first, start), max(last, end))
+
+
+def server_timing_header(timings, total):
+    """`Server-Timing` value with each stage's span and the total, in milliseconds."""
+    parts = [f"{stage};dur={(end - start) * 1000:.1f}" for stage, (start, end) in timings.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware: collects stage timings per request, adds `Server-Timing`, records request duration.
+
+    Streaming responses send headers before the pipeline runs, so their header
+    only carries what finished before the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = {}
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                header = server_timing_header(timings, time.perf_counter() - start)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", header.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            # Set by the router once a route matched; static mounts report their app's class
+            endpoint = scope.get("endpoint")
+            handler = getattr(endpoint, "__name__", type(endpoint).__name__) if endpoint else "unmatched"
+            metrics.observe(REQUEST_SECONDS, time.perf_counter() - start, handler=handler, status=status[0])
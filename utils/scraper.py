@@ -1,34 +1,317 @@
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
-def extract_news(company_name):
-    """Extract news articles for a given company name."""
-    base_url = "https://newsapi.org/v2/everything"
-    api_key = "3a7d16eaa9d7489fae472b23492c9a6b"  
+from utils.cache import DiskCache, LRUCache
+from utils.metrics import count_error, count_fallback
+from utils.singleflight import SingleFlight
+
+NEWSAPI_URL = os.getenv("NEWSAPI_URL", "https://newsapi.org/v2/everything")
+NEWSAPI_KEY = os.getenv("NEWSAPI_KEY", "3a7d16eaa9d7489fae472b23492c9a6b")
+
+# NewsAPI serves at most 100 articles per page
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = int(os.getenv("NEWS_PAGE_SIZE", "5"))
+DEFAULT_MAX_ARTICLES = int(os.getenv("NEWS_MAX_ARTICLES", "5"))
+
+# HTTP client settings
+CONNECT_TIMEOUT = float(os.getenv("NEWSAPI_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("NEWSAPI_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("NEWSAPI_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("NEWSAPI_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = 10.0
+POOL_SIZE = int(os.getenv("NEWSAPI_POOL_SIZE", "10"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Response cache: fresh for NEWS_CACHE_TTL seconds, then served stale for up to
+# NEWS_CACHE_STALE more seconds while a background refresh runs
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "300"))
+NEWS_CACHE_STALE = float(os.getenv("NEWS_CACHE_STALE", "900"))
+NEWS_CACHE_DIR = os.getenv("NEWS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "cache", "news"))
+# How often a worker waiting on another worker's fetch of the same page checks the shared cache
+NEWS_LEASE_POLL_SECONDS = 0.05
+
+
+def _build_session():
+    """Shared session so connections (and TLS handshakes) are reused across requests."""
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    return http
+
+
+session = _build_session()
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "attempts": 0, "retries": 0, "failures": 0}
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _backoff_delay(attempt, response=None):
+    """Exponential backoff with full jitter, honouring a numeric Retry-After header."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def fetch_json(url, params):
+    """GET a JSON document with timeouts, retrying 429/5xx and connection errors."""
+    _count("requests")
+    for attempt in range(MAX_RETRIES + 1):
+        _count("attempts")
+        response = None
+        try:
+            response = session.get(url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response.json()
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                _count("failures")
+                raise
+        except requests.HTTPError:
+            _count("failures")
+            raise
+
+        _count("retries")
+        time.sleep(_backoff_delay(attempt, response))
+
+
+def http_stats():
+    """Request, retry and connection-reuse counters for the shared session."""
+    new_connections = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                new_connections += pool.num_connections
+
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["new_connections"] = new_connections
+    stats["reused_connections"] = max(stats["attempts"] - new_connections, 0)
+    stats["connection_reuse_ratio"] = (
+        round(stats["reused_connections"] / stats["attempts"], 4) if stats["attempts"] else 0.0
+    )
+    return stats
+
+
+news_memory_cache = LRUCache(max_items=512)
+# Shared by every uvicorn worker, so one worker's fetch serves the others
+news_disk_cache = (
+    DiskCache(os.path.join(NEWS_CACHE_DIR, "news.sqlite3"), 64 * 1024 * 1024) if NEWS_CACHE_DIR else None
+)
+_news_flight = SingleFlight()
+_news_cache_stats = {
+    "fresh_hits": 0,
+    "stale_hits": 0,
+    "misses": 0,
+    "upstream_calls": 0,
+    "refresh_errors": 0,
+    "waited_on_other_worker": 0,
+}
+
+
+def _count_news(name):
+    with _stats_lock:
+        _news_cache_stats[name] += 1
+
+
+def _news_cache_key(params):
+    """Cache key for a NewsAPI page request; ignores the API key and query casing."""
+    key_params = {name: value for name, value in params.items() if name != "apiKey"}
+    key_params["q"] = " ".join(str(key_params.get("q", "")).lower().split())
+    return hashlib.sha256(f"{NEWSAPI_URL}|{json.dumps(key_params, sort_keys=True)}".encode("utf-8")).hexdigest()
+
+
+def _cached_entry(key):
+    entry = news_memory_cache.get(key)
+    if entry is None and news_disk_cache is not None:
+        entry = news_disk_cache.get(key)
+        if entry is not None:
+            news_memory_cache.set(key, entry)
+    return entry
 
-    params = {
-        "q": company_name,
-        "apiKey": api_key,
-        "language": "en",
-        "sortBy": "relevancy"
-    }
 
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        data = response.json()
+def _fetch_and_store(key, params):
+    _count_news("upstream_calls")
+    data = fetch_json(NEWSAPI_URL, params)
+    entry = {"fetched_at": time.time(), "data": data}
+    news_memory_cache.set(key, entry)
+    if news_disk_cache is not None:
+        news_disk_cache.set(key, entry)
+    return data
 
-        if "articles" not in data or not data["articles"]:
-            print("No articles found.")
-            return []
+
+def _lease_seconds():
+    """Longest a fetch can take with every retry, so a live holder's lease never lapses."""
+    return (CONNECT_TIMEOUT + READ_TIMEOUT) * (MAX_RETRIES + 1) + BACKOFF_MAX * MAX_RETRIES
+
+
+def _fresh_disk_entry(key):
+    entry = news_disk_cache.get(key)
+    if entry is not None and time.time() - entry["fetched_at"] < NEWS_CACHE_TTL:
+        news_memory_cache.set(key, entry)
+        return entry
+    return None
+
+
+def _fetch_across_workers(key, params, wait=True):
+    """Fetch a page once across all uvicorn workers sharing the disk cache.
+
+    The worker holding the page's lease calls NewsAPI; the others poll the
+    shared cache for its result (`wait`) or give up (None), and take over if
+    the holder fails.
+    """
+    if news_disk_cache is None:
+        return _fetch_and_store(key, params)
+
+    waited = False
+    while True:
+        token = news_disk_cache.try_lease(key, _lease_seconds())
+        if token is not None:
+            try:
+                # The previous holder may have stored the page just before releasing
+                entry = _fresh_disk_entry(key)
+                return entry["data"] if entry is not None else _fetch_and_store(key, params)
+            finally:
+                news_disk_cache.release_lease(key, token)
+        if not wait:
+            return None
+        if not waited:
+            _count_news("waited_on_other_worker")
+            waited = True
+        time.sleep(NEWS_LEASE_POLL_SECONDS)
+        entry = _fresh_disk_entry(key)
+        if entry is not None:
+            return entry["data"]
+
+
+def _refresh_in_background(key, params):
+    if _news_flight.in_flight(key):
+        return
+
+    def refresh():
+        try:
+            # Another worker already refreshing this page is as good as refreshing it here
+            _news_flight.do(key, _fetch_across_workers, key, params, False)
+        except Exception as e:
+            _count_news("refresh_errors")
+            print(f"⚠️ Background news refresh failed: {e}")
+
+    threading.Thread(target=refresh, name="news-refresh", daemon=True).start()
+
+
+def fetch_news_page(params):
+    """Fetch one NewsAPI page through the TTL cache.
+
+    Fresh entries are returned directly, stale ones are returned while a
+    background refresh runs, and concurrent misses for the same page share a
+    single upstream call: within a worker through SingleFlight, and across
+    workers through a lease in the shared disk cache.
+    """
+    if NEWS_CACHE_TTL <= 0:
+        _count_news("upstream_calls")
+        return fetch_json(NEWSAPI_URL, params)
+
+    key = _news_cache_key(params)
+    entry = _cached_entry(key)
+    if entry is not None:
+        age = time.time() - entry["fetched_at"]
+        if age < NEWS_CACHE_TTL:
+            _count_news("fresh_hits")
+            return entry["data"]
+        if age < NEWS_CACHE_TTL + NEWS_CACHE_STALE:
+            _count_news("stale_hits")
+            count_fallback("scrape", "stale_cache")
+            _refresh_in_background(key, params)
+            return entry["data"]
+
+    _count_news("misses")
+    return _news_flight.do(key, _fetch_across_workers, key, params)
+
+
+def news_cache_stats():
+    """Hit ratio, upstream-call and coalescing counters for the NewsAPI cache."""
+    with _stats_lock:
+        stats = dict(_news_cache_stats)
+    lookups = stats["fresh_hits"] + stats["stale_hits"] + stats["misses"]
+    stats["hit_ratio"] = round((stats["fresh_hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+    stats["coalesced"] = _news_flight.coalesced
+    stats["ttl_seconds"] = NEWS_CACHE_TTL
+    stats["stale_seconds"] = NEWS_CACHE_STALE
+    return stats
+
+
+def iter_news_pages(company_name, page_size=DEFAULT_PAGE_SIZE, max_articles=DEFAULT_MAX_ARTICLES, raise_errors=False):
+    """Yield news articles for a company one page at a time.
+
+    Each page is only requested when the caller asks for it, so work on the
+    first page can start before the next one is fetched. A failed fetch ends
+    the pages early, or is raised when `raise_errors` is set so callers can
+    tell it apart from a company with no news.
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    fetched = 0
+    page = 1
+
+    while fetched < max_articles:
+        params = {
+            "q": company_name,
+            "apiKey": NEWSAPI_KEY,
+            "language": "en",
+            "sortBy": "relevancy",
+            "pageSize": page_size,
+            "page": page,
+        }
+
+        try:
+            data = fetch_news_page(params)
+        except Exception as e:
+            print(f"Error fetching news: {e}")
+            count_error("scrape")
+            if raise_errors:
+                raise
+            return
+
+        raw_articles = data.get("articles") or []
 
         # Extract article titles and content
-        articles = []
-        for article in data["articles"][:5]:
-            articles.append(f"{article['title']}: {article['description']}")
+        articles = [
+            f"{article['title']}: {article['description']}"
+            for article in raw_articles[:max_articles - fetched]
+        ]
+        if not articles:
+            return
 
-        return articles
+        yield articles
 
-    except Exception as e:
-        print(f"Error fetching news: {e}")
-        return []
+        fetched += len(articles)
+        if len(raw_articles) < page_size or fetched >= data.get("totalResults", fetched + 1):
+            return
+        page += 1
+
+
+def extract_news(company_name, page_size=DEFAULT_PAGE_SIZE, max_articles=DEFAULT_MAX_ARTICLES, raise_errors=False):
+    """Extract news articles for a given company name."""
+    articles = [
+        article
+        for page in iter_news_pages(company_name, page_size, max_articles, raise_errors)
+        for article in page
+    ]
+    if not articles:
+        print("No articles found.")
+    return articles
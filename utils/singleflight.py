@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._in_flight
+
+
+class AsyncSingleFlight:
+    """Asyncio variant of SingleFlight that can also reuse recent results.
+
+    Concurrent `do()` calls for a key await one shared task. After it succeeds,
+    its result is returned for the same key for `reuse_seconds`.
+    """
+
+    def __init__(self, reuse_seconds=0.0):
+        self.reuse_seconds = reuse_seconds
+        self._in_flight = {}
+        self._recent = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.reused = 0
+
+    async def do(self, key, coroutine_factory):
+        now = time.monotonic()
+        recent = self._recent.get(key)
+        if recent is not None and recent[0] > now:
+            self.reused += 1
+            return recent[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine_factory())
+            self._in_flight[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda finished: self._finish(key, finished))
+        else:
+            self.coalesced += 1
+
+        # Shielded so one caller disconnecting doesn't cancel the shared work
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        self._in_flight.pop(key, None)
+        if self.reuse_seconds <= 0 or task.cancelled() or task.exception() is not None:
+            return
+
+        now = time.monotonic()
+        self._recent = {k: entry for k, entry in self._recent.items() if entry[0] > now}
+        self._recent[key] = (now + self.reuse_seconds, task.result())
+
+    def stats(self):
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "reused": self.reused,
+            "reuse_seconds": self.reuse_seconds,
+        }